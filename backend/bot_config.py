@@ -3,41 +3,77 @@ Discord Bot Configuration
 This file contains customizable settings for the Discord bot.
 """
 
-import json
-from typing import Dict, Any
+import aiofiles
+import orjson
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+_CONFIG_PATH = Path(__file__).resolve().parent / "bot_config.json"
+
+# Static embed text; only the channel mention is filled in per config
+_TIPS_VALUE = "• You can use keywords in any message\n• Slash commands work anywhere\n• Bot responds to mentions"
+_JOIN_ROLES_TMPL = "• Use the reaction roles in <#{ch}>\n• Contact a moderator for special roles\n• Check the rules first!"
+_JOIN_CHANNELS_TMPL = "• Most channels are auto-accessible\n• Some require specific roles\n• Ask in <#{ch}> for help"
+_JOIN_IMPORTANT_VALUE = "Make sure to read the rules before participating!"
+
+@dataclass(frozen=True, slots=True)
+class ResolvedConfig:
+    """Read-only snapshot of the values used on hot paths"""
+    rules_channel_id: str
+    general_channel_id: str
+    max_order_quantity: int
+    slash_command_descriptions: Tuple[Tuple[str, str], ...]
+    keyword_items: Tuple[Tuple[str, str], ...]
+
 class BotConfiguration:
     """Configuration manager for the Discord bot"""
     
-    def __init__(self, config_file: str = "bot_config.json"):
-        self.config_file = Path(__file__).parent / config_file
-        self.config = self.load_config()
+    def __init__(self, config_file: Optional[str] = None):
+        self.config_file = _CONFIG_PATH if config_file is None else _CONFIG_PATH.parent / config_file
+        self._dirty = False
+        self.config = self._load_initial_config()
+        self._build_derived()
     
-    def load_config(self) -> Dict[str, Any]:
+    def _load_initial_config(self) -> Dict[str, Any]:
+        """Load configuration at startup, before the event loop is running"""
+        try:
+            return orjson.loads(self.config_file.read_bytes())
+        except FileNotFoundError:
+            # Written to disk by the first flush()
+            self._dirty = True
+            return self.default_config()
+        except (OSError, ValueError) as e:
+            print(f"Error loading config: {e}")
+            return self.default_config()
+    
+    async def load_config(self) -> Dict[str, Any]:
         """Load configuration from JSON file or create default"""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading config: {e}")
-                return self.default_config()
-        else:
+        try:
+            async with aiofiles.open(self.config_file, 'rb') as f:
+                return orjson.loads(await f.read())
+        except FileNotFoundError:
             config = self.default_config()
-            self.save_config(config)
+            await self.save_config(config)
             return config
+        except (OSError, ValueError) as e:
+            print(f"Error loading config: {e}")
+            return self.default_config()
     
-    def save_config(self, config: Dict[str, Any] = None):
+    async def save_config(self, config: Dict[str, Any] = None) -> bool:
         """Save configuration to JSON file"""
         if config is None:
             config = self.config
         
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=4)
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            async with aiofiles.open(self.config_file, 'wb') as f:
+                await f.write(data)
+            return True
         except Exception as e:
             print(f"Error saving config: {e}")
+            return False
     
     def default_config(self) -> Dict[str, Any]:
         """Default configuration settings"""
@@ -127,30 +163,136 @@ class BotConfiguration:
         """Get order-specific settings"""
         return self.config.get("order_settings", {})
     
+    def get_help_embed_dict(self) -> Dict[str, Any]:
+        """Get the prebuilt /bot_help embed payload (use with discord.Embed.from_dict)"""
+        return self._help_embed_dict
+    
+    def get_join_embed_dict(self) -> Dict[str, Any]:
+        """Get the prebuilt /join embed payload (use with discord.Embed.from_dict)"""
+        return self._join_embed_dict
+    
+    def _build_derived(self):
+        """Precompute the resolved snapshot, help strings and embed payloads from the current config"""
+        channels = self.get_channels()
+        self.resolved = ResolvedConfig(
+            rules_channel_id=channels.get("rules", "1234567890123456789"),
+            general_channel_id=channels.get("general", "1234567890123456789"),
+            max_order_quantity=self.get_settings().get("max_order_quantity", 100),
+            slash_command_descriptions=tuple(
+                (cmd, info['description'])
+                for cmd, info in self.get_slash_commands().items()
+                if info.get('enabled', True)
+            ),
+            keyword_items=tuple(self.get_keywords_responses().items())
+        )
+        
+        fields = []
+        
+        self._slash_help_str = "\n".join(f"`/{cmd}` - {description}" 
+                                          for cmd, description in self.resolved.slash_command_descriptions)
+        # Discord rejects empty field values, so skip the field when every command is disabled
+        if self._slash_help_str:
+            fields.append({"name": "📋 Slash Commands", "value": self._slash_help_str, "inline": False})
+        
+        self._keyword_help_str = "\n".join(f"`{keyword}` - Bot responds when this word is mentioned" 
+                                            for keyword, _ in self.resolved.keyword_items[:5])  # Show first 5
+        if self._keyword_help_str:
+            fields.append({"name": "🔍 Keyword Responses", "value": self._keyword_help_str, "inline": False})
+        
+        fields.append({
+            "name": "💡 Tips",
+            "value": _TIPS_VALUE,
+            "inline": False
+        })
+        
+        self._help_embed_dict = {
+            "type": "rich",
+            "title": "🤖 Bot Help",
+            "description": "Here are all the available commands and features:",
+            "color": 0x3498db,
+            "fields": fields,
+            "footer": {"text": "Bot is ready to help!"}
+        }
+        
+        general_channel = self.resolved.general_channel_id
+        self._join_embed_dict = {
+            "type": "rich",
+            "title": "🚪 How to Join",
+            "description": "Here's how you can join roles and channels:",
+            "color": 0x2ecc71,
+            "fields": [
+                {
+                    "name": "🎭 Roles",
+                    "value": _JOIN_ROLES_TMPL.format(ch=general_channel),
+                    "inline": False
+                },
+                {
+                    "name": "📢 Channels",
+                    "value": _JOIN_CHANNELS_TMPL.format(ch=general_channel),
+                    "inline": False
+                },
+                {
+                    "name": "❗ Important",
+                    "value": _JOIN_IMPORTANT_VALUE,
+                    "inline": False
+                }
+            ]
+        }
+    
     def update_keyword_response(self, keyword: str, response: str):
         """Update a keyword response"""
+        if self.config["keywords_responses"].get(keyword) == response:
+            return
         self.config["keywords_responses"][keyword] = response
-        self.save_config()
+        self._dirty = True
+        self._build_derived()
     
     def update_channel(self, channel_name: str, channel_id: str):
         """Update a channel ID"""
+        if self.config["channels"].get(channel_name) == channel_id:
+            return
         self.config["channels"][channel_name] = channel_id
-        self.save_config()
+        self._dirty = True
+        self._build_derived()
     
     def add_keyword_response(self, keyword: str, response: str):
         """Add a new keyword response"""
+        if self.config["keywords_responses"].get(keyword) == response:
+            return
         self.config["keywords_responses"][keyword] = response
-        self.save_config()
+        self._dirty = True
+        self._build_derived()
     
     def remove_keyword_response(self, keyword: str):
         """Remove a keyword response"""
         if keyword in self.config["keywords_responses"]:
             del self.config["keywords_responses"][keyword]
-            self.save_config()
+            self._dirty = True
+            self._build_derived()
     
-    def reload_config(self):
+    async def flush(self):
+        """Write pending changes to file (mutations only mark the config dirty)"""
+        if not self._dirty:
+            return
+        
+        # Cleared before awaiting so mutations made during the write are kept
+        self._dirty = False
+        if not await self.save_config():
+            self._dirty = True
+    
+    async def reload_config(self):
         """Reload configuration from file"""
-        self.config = self.load_config()
+        await self.flush()
+        self.config = await self.load_config()
+        self._build_derived()
+
+@lru_cache(maxsize=1)
+def get_bot_config() -> BotConfiguration:
+    """Get the global configuration instance, loading it on first use"""
+    return BotConfiguration()
 
-# Create global configuration instance
-bot_config = BotConfiguration()
\ No newline at end of file
+def __getattr__(name: str):
+    # Keeps `from bot_config import bot_config` working without loading at import
+    if name == "bot_config":
+        return get_bot_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -34,15 +34,15 @@ async def demo_order_system():
             product_name="Discord Bot License",
             quantity=1
         )
-        print(f"✅ Order created: {order['order_number']}")
-        print(f"   Product: {order['product_name']}")
-        print(f"   Quantity: {order['quantity']}")
-        print(f"   Status: {order['status']}")
+        print(f"✅ Order created: {order.order_number}")
+        print(f"   Product: {order.product_name}")
+        print(f"   Quantity: {order.quantity}")
+        print(f"   Status: {order.status}")
         
         # Simulate payment confirmation
-        print(f"\n💳 Confirming payment for {order['order_number']}...")
+        print(f"\n💳 Confirming payment for {order.order_number}...")
         success = await order_mgr.update_order_status(
-            order['order_number'],
+            order.order_number,
             OrderStatus.PAID,
             "AdminUser",
             "PayPal payment confirmed"
@@ -50,9 +50,9 @@ async def demo_order_system():
         print(f"✅ Payment confirmed: {success}")
         
         # Update to processing
-        print(f"\n⚙️ Processing order {order['order_number']}...")
+        print(f"\n⚙️ Processing order {order.order_number}...")
         success = await order_mgr.update_order_status(
-            order['order_number'],
+            order.order_number,
             OrderStatus.PROCESSING,
             "AdminUser",
             "Order is being processed"
@@ -60,32 +60,35 @@ async def demo_order_system():
         print(f"✅ Status updated to Processing: {success}")
         
         # Complete the order
-        print(f"\n🎉 Completing order {order['order_number']}...")
+        print(f"\n🎉 Completing order {order.order_number}...")
         success = await order_mgr.update_order_status(
-            order['order_number'],
+            order.order_number,
             OrderStatus.COMPLETED,
             "AdminUser",
             "Order completed successfully"
         )
         print(f"✅ Order completed: {success}")
         
-        # Get order details
+        # Fetch final details, history and stats together; status updates above must stay sequential
+        final_order, history, stats = await asyncio.gather(
+            order_mgr.get_order(order.order_number),
+            order_mgr.get_order_history(order.order_number),
+            order_mgr.get_order_stats(),
+        )
+        
         print(f"\n📋 Final order details:")
-        final_order = await order_mgr.get_order(order['order_number'])
-        print(f"   Order Number: {final_order['order_number']}")
-        print(f"   Product: {final_order['product_name']}")
-        print(f"   Status: {final_order['status']}")
-        print(f"   Confirmed By: {final_order['confirmed_by']}")
+        print(f"   Order Number: {final_order.order_number}")
+        print(f"   Product: {final_order.product_name}")
+        print(f"   Status: {final_order.status}")
+        print(f"   Confirmed By: {final_order.confirmed_by}")
         
         # Get order history
         print(f"\n📈 Order history:")
-        history = await order_mgr.get_order_history(order['order_number'])
         for entry in history:
             print(f"   {entry['status_from']} → {entry['status_to']} by {entry['changed_by']}")
         
         # Get statistics
         print(f"\n📊 Order statistics:")
-        stats = await order_mgr.get_order_stats()
         print(f"   Total Orders: {stats['total_orders']}")
         print(f"   Status Breakdown: {stats['status_counts']}")
         
@@ -95,6 +98,8 @@ async def demo_order_system():
     except Exception as e:
         print(f"❌ Demo failed: {e}")
         return False
+    finally:
+        await order_mgr.close()
     
     return True
 
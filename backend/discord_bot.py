@@ -5,23 +5,94 @@ import os
 import logging
 from dotenv import load_dotenv
 from pathlib import Path
-import json
-from typing import Dict, Any
+from typing import Dict, Optional, Tuple
+from collections import deque
 import asyncio
+import time
 
-# Load environment variables
 ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# ASCII-only lowercasing table; keywords are ASCII, so full Unicode case folding is unnecessary
+_ASCII_LOWER = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds configured keywords in a single pass over a message
+    
+    Keywords must be ASCII: messages are lowercased byte-wise, so a non-ASCII keyword
+    could never match reliably and is rejected up front instead.
+    """
+    
+    def __init__(self, keywords_responses: Dict[str, str]):
+        non_ascii = [keyword for keyword in keywords_responses if not keyword.isascii()]
+        if non_ascii:
+            raise ValueError(f"Keywords must be ASCII: {non_ascii!r}")
+        self._responses = dict(keywords_responses)
+        
+        # Cheap prefilters: messages shorter than every keyword, or without any
+        # keyword's first letter (in either case), can skip the scan entirely
+        self.min_length = min(map(len, self._responses), default=0)
+        self.first_chars = frozenset(
+            ch for keyword in self._responses if keyword for ch in (keyword[0].lower(), keyword[0].upper())
+        )
+        
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [None]
+        
+        # Build the trie of keywords over their lowercased bytes
+        for keyword in self._responses:
+            node = 0
+            for ch in keyword.lower().encode('ascii'):
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(None)
+                node = nxt
+            self._out[node] = keyword
+        
+        # Breadth-first pass to set failure links and inherit outputs through them
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                if self._out[nxt] is None:
+                    self._out[nxt] = self._out[self._fail[nxt]]
+    
+    def find(self, text: str) -> Optional[Tuple[str, str]]:
+        """Return (keyword, response) for the longest keyword in text (earliest on ties), or None
+        
+        Matching is case-insensitive and does not depend on the configured keyword order.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        best = None
+        for ch in text.encode('utf-8', 'ignore').translate(_ASCII_LOWER):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            # out[node] is the longest keyword ending at this position
+            keyword = out[node]
+            if keyword is not None and (best is None or len(keyword) > len(best)):
+                best = keyword
+        if best is None:
+            return None
+        return best, self._responses[best]
+
 # Bot configuration
 class BotConfig:
+    __slots__ = ('keywords_responses', 'channels', 'slash_commands_help',
+                 'keyword_matcher', 'keywords_help_text')
+    
     def __init__(self):
         self.keywords_responses = {
             "help": "Here are the available commands! Use `/help` for more details.",
@@ -32,11 +103,12 @@ class BotConfig:
             "status": "Check your order status with `/order_status` or `/my_orders`!"
         }
         
+        # Snowflake IDs are kept as ints so they can go straight to get_channel()/discord.Object()
         self.channels = {
-            "rules": "1234567890123456789",  # Replace with actual channel ID
-            "general": "1234567890123456789",  # Replace with actual channel ID
-            "welcome": "1234567890123456789",  # Replace with actual channel ID
-            "orders": "1234567890123456789"   # Replace with actual channel ID
+            "rules": 1234567890123456789,  # Replace with actual channel ID
+            "general": 1234567890123456789,  # Replace with actual channel ID
+            "welcome": 1234567890123456789,  # Replace with actual channel ID
+            "orders": 1234567890123456789   # Replace with actual channel ID
         }
         
         self.slash_commands_help = {
@@ -48,6 +120,9 @@ class BotConfig:
             "/my_orders": "View your order history",
             "/order_status": "Check status of a specific order"
         }
+        
+        self.keyword_matcher = KeywordMatcher(self.keywords_responses)
+        self.keywords_help_text = ", ".join(f"`{keyword}`" for keyword in self.keywords_responses)
 
 config = BotConfig()
 
@@ -56,6 +131,17 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 
+# Seconds between background writes of pending configuration changes
+CONFIG_FLUSH_INTERVAL = 5
+
+# Outgoing message sends allowed in flight at once
+MAX_CONCURRENT_SENDS = 5
+
+# Seconds before the same keyword is answered again in a channel, and how many
+# (channel, keyword) cooldowns are tracked before the oldest are evicted
+KEYWORD_COOLDOWN = 30
+KEYWORD_COOLDOWN_MAX_ENTRIES = 1024
+
 class DiscordBot(commands.Bot):
     def __init__(self):
         super().__init__(
@@ -63,45 +149,117 @@ class DiscordBot(commands.Bot):
             intents=intents,
             help_command=None  # We'll create our own help command
         )
+        self._config_flush_task = None
+        self._send_slots = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        # (channel_id, keyword) -> monotonic time of the last reply, oldest first
+        self._keyword_cooldowns: Dict[Tuple[int, str], float] = {}
     
     async def setup_hook(self):
         """This is called when the bot is starting up"""
-        logger.info(f"Bot is starting up...")
+        logger.info("Bot is starting up...")
         
-        # Initialize order manager
+        # Database setup and cog loading are independent, so run them concurrently;
+        # each step logs its own failure so one cannot abort the others
+        await asyncio.gather(
+            self._initialize_order_db(),
+            self._load_basic_cogs(),
+            self._load_order_cogs()
+        )
+        
+        # Sync slash commands once every cog is registered; a development guild
+        # syncs instantly, while the global sync is rate limited and slow to propagate
+        try:
+            dev_guild_id = os.getenv('DEV_GUILD_ID')
+            if dev_guild_id:
+                guild = discord.Object(id=int(dev_guild_id))
+                self.tree.copy_global_to(guild=guild)
+                synced = await self.tree.sync(guild=guild)
+            else:
+                synced = await self.tree.sync()
+            logger.info("Synced %d slash commands", len(synced))
+        except Exception as e:
+            logger.error("Failed to sync slash commands: %s", e)
+        
+        # Persist configuration changes in the background
+        self._config_flush_task = asyncio.create_task(self._flush_config_periodically())
+    
+    async def _initialize_order_db(self):
+        """Initialize the order manager's database"""
         try:
             from order_manager import order_manager
             await order_manager.initialize_db()
             logger.info("Order database initialized")
         except Exception as e:
-            logger.error(f"Failed to initialize order database: {e}")
-        
-        # Load cogs
+            logger.error("Failed to initialize order database: %s", e)
+    
+    async def _load_basic_cogs(self):
+        """Load the general, navigation and admin cogs"""
         try:
             from bot_cogs import setup_cogs
             await setup_cogs(self)
             logger.info("Basic cogs loaded")
         except Exception as e:
-            logger.error(f"Failed to load basic cogs: {e}")
-        
+            logger.error("Failed to load basic cogs: %s", e)
+    
+    async def _load_order_cogs(self):
+        """Load the order management cogs"""
         try:
             from order_cogs import setup_order_cogs
             await setup_order_cogs(self)
             logger.info("Order cogs loaded")
         except Exception as e:
-            logger.error(f"Failed to load order cogs: {e}")
+            logger.error("Failed to load order cogs: %s", e)
+    
+    async def send_limited(self, send, *args, **kwargs):
+        """Await a send coroutine function with bounded concurrency; discord.py's HTTP client retries 429s itself"""
+        async with self._send_slots:
+            return await send(*args, **kwargs)
+    
+    def _keyword_on_cooldown(self, channel_id: int, keyword: str) -> bool:
+        """Return True if the keyword was answered in this channel recently, otherwise start its cooldown"""
+        now = time.monotonic()
+        key = (channel_id, keyword)
+        last = self._keyword_cooldowns.get(key)
+        if last is not None and now - last < KEYWORD_COOLDOWN:
+            return True
         
-        # Sync slash commands
-        try:
-            synced = await self.tree.sync()
-            logger.info(f"Synced {len(synced)} slash commands")
-        except Exception as e:
-            logger.error(f"Failed to sync slash commands: {e}")
+        # Re-insert so the dict stays ordered oldest reply first, then evict from the front
+        self._keyword_cooldowns.pop(key, None)
+        self._keyword_cooldowns[key] = now
+        if len(self._keyword_cooldowns) > KEYWORD_COOLDOWN_MAX_ENTRIES:
+            cooldowns = self._keyword_cooldowns
+            while cooldowns:
+                oldest = next(iter(cooldowns))
+                if len(cooldowns) <= KEYWORD_COOLDOWN_MAX_ENTRIES and now - cooldowns[oldest] < KEYWORD_COOLDOWN:
+                    break
+                del cooldowns[oldest]
+        return False
+    
+    async def _flush_config_periodically(self):
+        """Write batched configuration changes to disk every few seconds"""
+        from bot_config import get_bot_config
+        
+        while True:
+            await asyncio.sleep(CONFIG_FLUSH_INTERVAL)
+            await get_bot_config().flush()
+    
+    async def close(self):
+        """Flush pending configuration changes and close the order database before shutting down"""
+        if self._config_flush_task:
+            self._config_flush_task.cancel()
+        
+        from bot_config import get_bot_config
+        await get_bot_config().flush()
+        
+        from order_manager import order_manager
+        await order_manager.close()
+        
+        await super().close()
     
     async def on_ready(self):
         """Called when the bot is ready"""
-        logger.info(f'{self.user} has connected to Discord!')
-        logger.info(f'Bot is in {len(self.guilds)} guilds')
+        logger.info('%s has connected to Discord!', self.user)
+        logger.info('Bot is in %d guilds', len(self.guilds))
         
         # Set bot status
         await self.change_presence(
@@ -117,14 +275,26 @@ class DiscordBot(commands.Bot):
         if message.author.bot:
             return
         
-        # Check for keywords in message content
-        message_content = message.content.lower()
-        
-        for keyword, response in config.keywords_responses.items():
-            if keyword in message_content:
-                logger.info(f"Keyword '{keyword}' detected in message from {message.author}")
-                await message.channel.send(response)
-                break
+        # Check for keywords in message content; replies are only sent in guild
+        # channels the bot can post in, so DMs and prefix commands skip the scan
+        # (cheapest checks first)
+        content = message.content
+        matcher = config.keyword_matcher
+        if (
+            message.guild is not None
+            and not content.startswith(self.command_prefix)
+            and len(content) >= matcher.min_length
+            and not matcher.first_chars.isdisjoint(content)
+            and message.channel.permissions_for(message.guild.me).send_messages
+        ):
+            match = matcher.find(content)
+            if match:
+                keyword, response = match
+                if not self._keyword_on_cooldown(message.channel.id, keyword):
+                    logger.info("Keyword '%s' detected in message from %s", keyword, message.author)
+                    await self.send_limited(message.channel.send, response)
+                else:
+                    logger.debug("Keyword '%s' from %s suppressed by cooldown", keyword, message.author)
         
         # Process commands
         await self.process_commands(message)
@@ -134,83 +304,82 @@ class DiscordBot(commands.Bot):
         if isinstance(error, commands.CommandNotFound):
             await ctx.send("Command not found! Use `/help` to see available commands.")
         else:
-            logger.error(f"Command error: {error}")
+            logger.error("Command error: %s", error)
             await ctx.send("An error occurred while processing the command.")
 
 # Create bot instance
 bot = DiscordBot()
 
+# Static /help embed payload, built once and reused for every call
+HELP_EMBED_DICT = {
+    "type": "rich",
+    "title": "🤖 Bot Help",
+    "description": "Here are all the available commands and features:",
+    "color": 0x3498db,
+    "fields": [
+        {
+            "name": "📋 General Commands",
+            "value": "`/help` - Shows this help message\n`/rules` - View server rules\n`/join` - Join instructions\n`/ping` - Check bot response",
+            "inline": False
+        },
+        {
+            "name": "🛍️ Order Commands",
+            "value": "`/place_order` - Place a new order\n`/my_orders` - View your orders\n`/order_status` - Check order status",
+            "inline": False
+        },
+        {
+            "name": "👑 Admin Commands",
+            "value": "`/confirm_payment` - Confirm payment\n`/update_order_status` - Update order status\n`/view_orders` - View all orders\n`/search_orders` - Search orders\n`/order_report` - Generate reports",
+            "inline": False
+        },
+        {
+            "name": "🔍 Keyword Responses",
+            "value": f"The bot responds to these keywords: {config.keywords_help_text}",
+            "inline": False
+        },
+        {
+            "name": "💡 Order Process",
+            "value": "1. Use `/place_order` to create order\n2. Make PayPal payment\n3. Admin confirms payment\n4. Order gets processed",
+            "inline": False
+        }
+    ],
+    "footer": {"text": "Need help? Contact an admin or moderator!"}
+}
+HELP_EMBED = discord.Embed.from_dict(HELP_EMBED_DICT)
+
 # Basic slash commands (additional ones are in cogs)
 @bot.tree.command(name="help", description="Shows available commands and help information")
 async def help_command(interaction: discord.Interaction):
     """Help command showing all available commands"""
-    logger.info(f"Help command used by {interaction.user}")
-    
-    embed = discord.Embed(
-        title="🤖 Bot Help",
-        description="Here are all the available commands and features:",
-        color=discord.Color.blue()
-    )
-    
-    # Add slash commands
-    embed.add_field(
-        name="📋 General Commands",
-        value="`/help` - Shows this help message\n`/rules` - View server rules\n`/join` - Join instructions\n`/ping` - Check bot response",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="🛍️ Order Commands",
-        value="`/place_order` - Place a new order\n`/my_orders` - View your orders\n`/order_status` - Check order status",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="👑 Admin Commands",
-        value="`/confirm_payment` - Confirm payment\n`/update_order_status` - Update order status\n`/view_orders` - View all orders\n`/search_orders` - Search orders\n`/order_report` - Generate reports",
-        inline=False
-    )
+    logger.info("Help command used by %s", interaction.user)
     
-    # Add keyword responses
-    embed.add_field(
-        name="🔍 Keyword Responses",
-        value="The bot responds to these keywords: `help`, `rules`, `join`, `order`, `payment`, `status`",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="💡 Order Process",
-        value="1. Use `/place_order` to create order\n2. Make PayPal payment\n3. Admin confirms payment\n4. Order gets processed",
-        inline=False
-    )
-    
-    embed.set_footer(text="Need help? Contact an admin or moderator!")
-    
-    await interaction.response.send_message(embed=embed)
+    await interaction.response.send_message(embed=HELP_EMBED)
 
 @bot.tree.command(name="ping", description="Checks if the bot is responding")
 async def ping_command(interaction: discord.Interaction):
-    """Ping command to check bot responsiveness"""
-    logger.info(f"Ping command used by {interaction.user}")
-    
-    latency = round(bot.latency * 1000)
-    
-    embed = discord.Embed(
-        title="🏓 Pong!",
-        description=f"Bot is responding!\nLatency: {latency}ms",
-        color=discord.Color.green()
-    )
+    """Ping command reporting gateway latency and the measured reply round trip"""
+    logger.info("Ping command used by %s", interaction.user)
     
-    embed.add_field(name="🛍️ Order System", value="✅ Online", inline=True)
-    embed.add_field(name="📋 Commands", value="✅ Active", inline=True)
+    start = time.perf_counter_ns()
+    await interaction.response.send_message("🏓 Pong!")
+    reply_ms = (time.perf_counter_ns() - start) // 1_000_000
     
-    await interaction.response.send_message(embed=embed)
+    api_ms = round(bot.latency * 1000)
+    await interaction.edit_original_response(content=f"🏓 Pong! API: {api_ms}ms | Bot: {reply_ms}ms")
 
 # Error handling for slash commands
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
     """Handle slash command errors"""
-    logger.error(f"Slash command error: {error}")
+    if isinstance(error, app_commands.CommandOnCooldown):
+        if not interaction.response.is_done():
+            await interaction.response.send_message(
+                f"⏳ Please wait {error.retry_after:.1f}s before using this command again.",
+                ephemeral=True
+            )
+        return
+    
+    logger.error("Slash command error: %s", error)
     
     if not interaction.response.is_done():
         await interaction.response.send_message(
@@ -221,6 +390,13 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
 # Main function to run the bot
 async def main():
     """Main function to start the bot"""
+    # Environment and logging are set up here so importing this module has no side effects
+    load_dotenv(ROOT_DIR / '.env')
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     token = os.getenv('DISCORD_BOT_TOKEN')
     
     if not token:
@@ -235,7 +411,16 @@ async def main():
     except discord.LoginFailure:
         logger.error("Invalid bot token!")
     except Exception as e:
-        logger.error(f"Bot error: {e}")
+        logger.error("Bot error: %s", e)
+
+def event_loop_factory():
+    """Return uvloop's loop factory when it is installed, otherwise None for the default loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    with asyncio.Runner(loop_factory=event_loop_factory()) as runner:
+        runner.run(main())
\ No newline at end of file
@@ -3,22 +3,150 @@ Order Management Cogs for Discord Bot
 Contains order-related commands and functionality
 """
 
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from typing import Optional
-from order_manager import order_manager, OrderStatus
+import time
+from typing import Dict, Final, Optional
+from cachetools import TTLCache
+from order_manager import order_manager, OrderStatus, STATUS_EMOJI
+from bot_config import get_bot_config
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# "<emoji> <status>" labels, built once per status value
+STATUS_LABELS: Final[dict[str, str]] = {status: f"{emoji} {status}" for status, emoji in STATUS_EMOJI.items()}
+
+# Static parts of the DM notification embeds; only order-specific fields are filled in per call
+_PAYMENT_CONFIRMED_EMBED: Final = {"type": "rich", "title": "✅ Payment Confirmed!", "color": 0x2ecc71}
+_STATUS_UPDATED_EMBED: Final = {"type": "rich", "title": "📋 Order Status Updated", "color": 0x3498db}
+
+# Short-lived read-through cache of each user's newest orders; every write path invalidates it
+_user_orders_cache = TTLCache(maxsize=4096, ttl=30)
+
+# Users fetched over the API because they weren't in the client cache, kept for 10 minutes
+_fetched_users = TTLCache(maxsize=1024, ttl=600)
+
+# Aggregate stats for /order_report, reused for STATS_CACHE_TTL seconds
+STATS_CACHE_TTL = 60
+_stats_cache = {"ts": 0.0, "data": None}
+
+# Orders shown per page by /view_orders and /search_orders
+ORDERS_PER_PAGE = 5
+
+# Seconds a user must wait between uses of each admin order mutation command
+ADMIN_MUTATION_COOLDOWN = 2.0
+
+# Role names that grant access to admin order commands
+ADMIN_ROLE_NAMES: Final[frozenset[str]] = frozenset({"admin", "moderator", "mod"})
+
+# guild_id -> IDs of that guild's admin/mod roles; dropped whenever the guild's roles change
+_admin_role_ids_by_guild: Dict[int, frozenset[int]] = {}
+
+def _is_admin_or_mod(user: discord.Member) -> bool:
+    """Check the user's roles against the guild's cached admin/mod role IDs"""
+    guild = getattr(user, "guild", None)
+    if guild is None:
+        return False
+    
+    admin_role_ids = _admin_role_ids_by_guild.get(guild.id)
+    if admin_role_ids is None:
+        admin_role_ids = frozenset(role.id for role in guild.roles if role.name.lower() in ADMIN_ROLE_NAMES)
+        _admin_role_ids_by_guild[guild.id] = admin_role_ids
+    return not admin_role_ids.isdisjoint(role.id for role in user.roles)
+
+def _invalidate_order_caches(user_id: str):
+    """Drop cached lookups affected by a change to a user's orders"""
+    _user_orders_cache.pop(user_id, None)
+    _stats_cache["ts"] = 0.0
+
+class OrdersPaginator(discord.ui.View):
+    """Prev/Next pager over a list of orders, rendering one page of embed fields at a time"""
+    
+    def __init__(self, orders: list, title: str, description: str, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.orders = orders
+        self.title = title
+        self.description = description
+        self.page = 0
+        self.page_count = max(1, -(-len(orders) // ORDERS_PER_PAGE))
+        # The command's interaction, set by send(); its user owns the pager
+        self.interaction: Optional[discord.Interaction] = None
+        self._update_buttons()
+    
+    def render(self) -> discord.Embed:
+        """Build the embed for the current page"""
+        embed = discord.Embed(title=self.title, description=self.description, color=discord.Color.blue())
+        
+        start = self.page * ORDERS_PER_PAGE
+        for order in self.orders[start:start + ORDERS_PER_PAGE]:
+            status_emoji = order.status_emoji
+            
+            embed.add_field(
+                name=f"{order.order_number} - {order.username}",
+                value=f"Product: {order.product_name}\nQty: {order.quantity}\nStatus: {status_emoji} {order.status}\nCreated: {order.created_rel}",
+                inline=True
+            )
+        
+        if self.page_count > 1:
+            embed.set_footer(text=f"Page {self.page + 1}/{self.page_count}")
+        return embed
+    
+    async def send(self, interaction: discord.Interaction):
+        """Show the first page in the deferred response, attaching the buttons only when there is more than one page"""
+        self.interaction = interaction
+        if self.page_count > 1:
+            await interaction.edit_original_response(embed=self.render(), view=self)
+        else:
+            await interaction.edit_original_response(embed=self.render())
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Only let the user who ran the command turn the pages"""
+        if self.interaction is not None and interaction.user.id == self.interaction.user.id:
+            return True
+        await interaction.response.send_message("❌ Only the person who ran this command can change pages.", ephemeral=True)
+        return False
+    
+    async def on_timeout(self):
+        """Grey out the buttons once the view stops listening, so stale clicks don't fail"""
+        for child in self.children:
+            child.disabled = True
+        if self.interaction is None:
+            return
+        try:
+            await self.interaction.edit_original_response(view=self)
+        except discord.HTTPException as e:
+            logger.debug("Could not disable expired order pager: %s", e)
+    
+    def _update_buttons(self):
+        """Disable the buttons that would move past either end"""
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+    
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the previous page"""
+        self.page -= 1
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.render(), view=self)
+    
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the next page"""
+        self.page += 1
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
 class OrderCog(commands.Cog):
     """Order management commands for regular users"""
     
     def __init__(self, bot):
         self.bot = bot
         self.order_manager = order_manager
+        self.config = get_bot_config()
     
     @app_commands.command(name="place_order", description="Place a new order")
     @app_commands.describe(
@@ -27,19 +155,21 @@ class OrderCog(commands.Cog):
     )
     async def place_order(self, interaction: discord.Interaction, product_name: str, quantity: int):
         """Place a new order"""
-        logger.info(f"Order placement attempt by {interaction.user}")
+        logger.info("Order placement attempt by %s", interaction.user)
         
         # Validate quantity
         if quantity <= 0:
             await interaction.response.send_message("❌ Quantity must be a positive number!", ephemeral=True)
             return
         
-        if quantity > 100:
-            await interaction.response.send_message("❌ Quantity cannot exceed 100 items per order!", ephemeral=True)
+        max_quantity = self.config.resolved.max_order_quantity
+        if quantity > max_quantity:
+            await interaction.response.send_message(f"❌ Quantity cannot exceed {max_quantity} items per order!", ephemeral=True)
             return
         
         # Validate product name
-        if len(product_name.strip()) < 2:
+        product_name = product_name.strip()
+        if len(product_name) < 2:
             await interaction.response.send_message("❌ Product name must be at least 2 characters!", ephemeral=True)
             return
         
@@ -48,10 +178,12 @@ class OrderCog(commands.Cog):
             order = await self.order_manager.create_order(
                 user_id=str(interaction.user.id),
                 username=interaction.user.display_name,
-                product_name=product_name.strip(),
+                product_name=product_name,
                 quantity=quantity
             )
             
+            _invalidate_order_caches(order.user_id)
+            
             # Create order confirmation embed
             embed = discord.Embed(
                 title="🛍️ Order Placed Successfully!",
@@ -59,12 +191,12 @@ class OrderCog(commands.Cog):
                 color=discord.Color.green()
             )
             
-            embed.add_field(name="Order Number", value=f"`{order['order_number']}`", inline=True)
+            embed.add_field(name="Order Number", value=f"`{order.order_number}`", inline=True)
             embed.add_field(name="Product", value=product_name, inline=True)
             embed.add_field(name="Quantity", value=str(quantity), inline=True)
-            embed.add_field(name="Status", value="🟡 Pending Payment", inline=True)
+            embed.add_field(name="Status", value=f"{order.status_emoji} Pending Payment", inline=True)
             embed.add_field(name="Payment Method", value="PayPal", inline=True)
-            embed.add_field(name="Created", value=f"<t:{int(datetime.fromisoformat(order['created_at'].replace('Z', '+00:00')).timestamp())}:R>", inline=True)
+            embed.add_field(name="Created", value=order.created_rel, inline=True)
             
             embed.add_field(
                 name="📋 Next Steps", 
@@ -72,24 +204,33 @@ class OrderCog(commands.Cog):
                 inline=False
             )
             
-            embed.set_footer(text=f"Order ID: {order['order_number']} | Use /my_orders to track your orders")
+            embed.set_footer(text=f"Order ID: {order.order_number} | Use /my_orders to track your orders")
             
             await interaction.response.send_message(embed=embed)
             
             # Log order creation
-            logger.info(f"Order {order['order_number']} created by {interaction.user.display_name}")
+            logger.info("Order %s created by %s", order.order_number, interaction.user.display_name)
             
         except Exception as e:
-            logger.error(f"Error creating order: {e}")
+            logger.error("Error creating order: %s", e)
             await interaction.response.send_message("❌ An error occurred while placing your order. Please try again.", ephemeral=True)
     
     @app_commands.command(name="my_orders", description="View your orders")
     async def my_orders(self, interaction: discord.Interaction):
         """View user's orders"""
-        logger.info(f"Order lookup by {interaction.user}")
+        logger.info("Order lookup by %s", interaction.user)
+        
+        # Acknowledge before hitting the database so slow queries cannot expire the interaction
+        await interaction.response.defer(ephemeral=True)
         
         try:
-            orders = await self.order_manager.get_user_orders(str(interaction.user.id))
+            user_id = str(interaction.user.id)
+            # Only the newest page is shown, so that is all that gets fetched
+            cached = _user_orders_cache.get(user_id)
+            if cached is None:
+                cached = await self.order_manager.get_user_orders_page(user_id, limit=ORDERS_PER_PAGE)
+                _user_orders_cache[user_id] = cached
+            orders, total = cached
             
             if not orders:
                 embed = discord.Embed(
@@ -98,107 +239,98 @@ class OrderCog(commands.Cog):
                     color=discord.Color.blue()
                 )
                 embed.add_field(name="Get Started", value="Use `/place_order` to place your first order!", inline=False)
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
             # Create orders embed
             embed = discord.Embed(
                 title="📦 Your Orders",
-                description=f"You have {len(orders)} order(s)",
+                description=f"You have {total} order(s)",
                 color=discord.Color.blue()
             )
             
-            for order in orders[:5]:  # Show last 5 orders
-                status_emoji = {
-                    "Pending": "🟡",
-                    "Paid": "🟢",
-                    "Processing": "🔄",
-                    "Completed": "✅",
-                    "Cancelled": "❌"
-                }.get(order["status"], "⚪")
+            for order in orders:
+                status_emoji = order.status_emoji
                 
                 embed.add_field(
-                    name=f"{order['order_number']} - {order['product_name']}",
-                    value=f"Status: {status_emoji} {order['status']}\nQuantity: {order['quantity']}\nCreated: <t:{int(datetime.fromisoformat(order['created_at']).timestamp())}:R>",
+                    name=f"{order.order_number} - {order.product_name}",
+                    value=f"Status: {status_emoji} {order.status}\nQuantity: {order.quantity}\nCreated: {order.created_rel}",
                     inline=True
                 )
             
-            if len(orders) > 5:
+            if total > len(orders):
                 embed.add_field(
                     name="📋 More Orders", 
-                    value=f"Showing 5 of {len(orders)} orders. Use `/order_status` to check specific orders.", 
+                    value=f"Showing {len(orders)} of {total} orders. Use `/order_status` to check specific orders.", 
                     inline=False
                 )
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
         except Exception as e:
-            logger.error(f"Error retrieving orders: {e}")
-            await interaction.response.send_message("❌ An error occurred while retrieving your orders.", ephemeral=True)
+            logger.error("Error retrieving orders: %s", e)
+            await interaction.followup.send("❌ An error occurred while retrieving your orders.", ephemeral=True)
     
     @app_commands.command(name="order_status", description="Check the status of a specific order")
     @app_commands.describe(order_number="Order number (e.g., ORD-001)")
     async def order_status(self, interaction: discord.Interaction, order_number: str):
         """Check order status"""
-        logger.info(f"Order status check for {order_number} by {interaction.user}")
+        order_number = order_number.upper()
+        logger.info("Order status check for %s by %s", order_number, interaction.user)
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
         
         try:
-            order = await self.order_manager.get_order(order_number.upper())
+            # The order and its history are independent reads, so fetch them together
+            order, history = await asyncio.gather(
+                self.order_manager.get_order(order_number),
+                self.order_manager.get_order_history(order_number)
+            )
             
             if not order:
-                await interaction.response.send_message("❌ Order not found! Please check the order number.", ephemeral=True)
+                await interaction.edit_original_response(content="❌ Order not found! Please check the order number.")
                 return
             
             # Check if user owns this order or is admin
-            if order["user_id"] != str(interaction.user.id):
+            if order.user_id != str(interaction.user.id):
                 # Check if user has admin/moderator permissions
-                if not any(role.name.lower() in ['admin', 'moderator', 'mod'] for role in interaction.user.roles):
-                    await interaction.response.send_message("❌ You can only view your own orders!", ephemeral=True)
+                if not _is_admin_or_mod(interaction.user):
+                    await interaction.edit_original_response(content="❌ You can only view your own orders!")
                     return
             
-            # Get order history
-            history = await self.order_manager.get_order_history(order_number.upper())
-            
-            status_emoji = {
-                "Pending": "🟡",
-                "Paid": "🟢",
-                "Processing": "🔄",
-                "Completed": "✅",
-                "Cancelled": "❌"
-            }.get(order["status"], "⚪")
+            status_emoji = order.status_emoji
             
             embed = discord.Embed(
-                title=f"📋 Order Details - {order['order_number']}",
+                title=f"📋 Order Details - {order.order_number}",
                 color=discord.Color.blue()
             )
             
-            embed.add_field(name="Product", value=order["product_name"], inline=True)
-            embed.add_field(name="Quantity", value=str(order["quantity"]), inline=True)
-            embed.add_field(name="Status", value=f"{status_emoji} {order['status']}", inline=True)
-            embed.add_field(name="Customer", value=order["username"], inline=True)
-            embed.add_field(name="Payment Method", value=order["payment_method"], inline=True)
-            embed.add_field(name="Created", value=f"<t:{int(datetime.fromisoformat(order['created_at']).timestamp())}:R>", inline=True)
+            embed.add_field(name="Product", value=order.product_name, inline=True)
+            embed.add_field(name="Quantity", value=str(order.quantity), inline=True)
+            embed.add_field(name="Status", value=f"{status_emoji} {order.status}", inline=True)
+            embed.add_field(name="Customer", value=order.username, inline=True)
+            embed.add_field(name="Payment Method", value=order.payment_method, inline=True)
+            embed.add_field(name="Created", value=order.created_rel, inline=True)
             
-            if order["confirmed_by"]:
-                embed.add_field(name="Confirmed By", value=order["confirmed_by"], inline=True)
+            if order.confirmed_by:
+                embed.add_field(name="Confirmed By", value=order.confirmed_by, inline=True)
             
-            if order["notes"]:
-                embed.add_field(name="Notes", value=order["notes"], inline=False)
+            if order.notes:
+                embed.add_field(name="Notes", value=order.notes, inline=False)
             
             # Add status history
             if history:
                 history_text = ""
                 for h in history[:3]:  # Show last 3 status changes
-                    timestamp = int(datetime.fromisoformat(h["changed_at"]).timestamp())
-                    history_text += f"• {h['status_from']} → {h['status_to']} by {h['changed_by']} <t:{timestamp}:R>\n"
+                    history_text += f"• {h['status_from']} → {h['status_to']} by {h['changed_by']} <t:{h['changed_ts']}:R>\n"
                 
                 embed.add_field(name="📈 Recent History", value=history_text, inline=False)
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.edit_original_response(embed=embed)
             
         except Exception as e:
-            logger.error(f"Error checking order status: {e}")
-            await interaction.response.send_message("❌ An error occurred while checking the order status.", ephemeral=True)
+            logger.error("Error checking order status: %s", e)
+            await interaction.edit_original_response(content="❌ An error occurred while checking the order status.")
 
 class AdminOrderCog(commands.Cog):
     """Admin-only order management commands"""
@@ -206,77 +338,119 @@ class AdminOrderCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.order_manager = order_manager
+        # Strong references keep pending DM notifications from being garbage collected
+        self._bg_tasks: set[asyncio.Task] = set()
+    
+    async def cog_unload(self):
+        """Let pending DM notifications finish before the cog goes away"""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+    
+    def _notify_user(self, user_id: str, embed: discord.Embed, reason: str):
+        """DM the order's owner in the background so the admin's reply isn't held up"""
+        task = asyncio.create_task(self._send_user_dm(int(user_id), embed, reason))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+    
+    async def _send_user_dm(self, user_id: int, embed: discord.Embed, reason: str):
+        """Send a notification embed to a user, logging rather than raising on failure"""
+        try:
+            user = self.bot.get_user(user_id) or _fetched_users.get(user_id)
+            if user is None:
+                user = await self.bot.fetch_user(user_id)
+                _fetched_users[user_id] = user
+            await user.send(embed=embed)
+        except Exception as e:
+            logger.warning("Could not notify user about %s: %s", reason, e)
     
     def is_admin_or_mod(self, user: discord.Member) -> bool:
         """Check if user has admin or moderator permissions"""
-        return any(role.name.lower() in ['admin', 'moderator', 'mod'] for role in user.roles)
+        return _is_admin_or_mod(user)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        """Forget the guild's cached admin role IDs when its roles change"""
+        _admin_role_ids_by_guild.pop(role.guild.id, None)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        """Forget the guild's cached admin role IDs when its roles change"""
+        _admin_role_ids_by_guild.pop(after.guild.id, None)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        """Forget the guild's cached admin role IDs when its roles change"""
+        _admin_role_ids_by_guild.pop(role.guild.id, None)
     
     @app_commands.command(name="confirm_payment", description="Confirm payment for an order (Admin/Mod only)")
     @app_commands.describe(
         order_number="Order number (e.g., ORD-001)",
         notes="Optional notes about the payment confirmation"
     )
+    @app_commands.checks.cooldown(1, ADMIN_MUTATION_COOLDOWN)
     async def confirm_payment(self, interaction: discord.Interaction, order_number: str, notes: Optional[str] = None):
         """Confirm payment for an order"""
+        order_number = order_number.upper()
         if not self.is_admin_or_mod(interaction.user):
             await interaction.response.send_message("❌ You don't have permission to use this command!", ephemeral=True)
             return
         
-        logger.info(f"Payment confirmation attempt for {order_number} by {interaction.user}")
+        logger.info("Payment confirmation attempt for %s by %s", order_number, interaction.user)
+        
+        await interaction.response.defer(ephemeral=True)
         
         try:
-            order = await self.order_manager.get_order(order_number.upper())
+            order = await self.order_manager.get_order(order_number)
             
             if not order:
-                await interaction.response.send_message("❌ Order not found!", ephemeral=True)
+                await interaction.followup.send("❌ Order not found!", ephemeral=True)
                 return
             
-            if order["status"] != "Pending":
-                await interaction.response.send_message(f"❌ Order is already {order['status']}. Can only confirm payment for pending orders.", ephemeral=True)
+            if order.status != "Pending":
+                await interaction.followup.send(f"❌ Order is already {order.status}. Can only confirm payment for pending orders.", ephemeral=True)
                 return
             
             # Update order status to Paid
             success = await self.order_manager.update_order_status(
-                order_number.upper(),
+                order_number,
                 OrderStatus.PAID,
                 interaction.user.display_name,
                 notes or "Payment confirmed by admin"
             )
             
             if success:
+                _invalidate_order_caches(order.user_id)
+                
                 # Notify user
-                try:
-                    user = await self.bot.fetch_user(int(order["user_id"]))
-                    if user:
-                        embed = discord.Embed(
-                            title="✅ Payment Confirmed!",
-                            description=f"Your payment for order {order['order_number']} has been confirmed!",
-                            color=discord.Color.green()
-                        )
-                        embed.add_field(name="Order Number", value=order["order_number"], inline=True)
-                        embed.add_field(name="Product", value=order["product_name"], inline=True)
-                        embed.add_field(name="Quantity", value=str(order["quantity"]), inline=True)
-                        embed.add_field(name="Status", value="🟢 Paid", inline=True)
-                        embed.add_field(name="Confirmed By", value=interaction.user.display_name, inline=True)
-                        
-                        if notes:
-                            embed.add_field(name="Notes", value=notes, inline=False)
-                        
-                        embed.add_field(name="Next Steps", value="Your order is now paid and will be processed soon!", inline=False)
-                        
-                        await user.send(embed=embed)
-                except Exception as e:
-                    logger.warning(f"Could not notify user about payment confirmation: {e}")
+                fields = [
+                    {"name": "Order Number", "value": order.order_number, "inline": True},
+                    {"name": "Product", "value": order.product_name, "inline": True},
+                    {"name": "Quantity", "value": str(order.quantity), "inline": True},
+                    {"name": "Status", "value": STATUS_LABELS["Paid"], "inline": True},
+                    {"name": "Confirmed By", "value": interaction.user.display_name, "inline": True}
+                ]
+                
+                if notes:
+                    fields.append({"name": "Notes", "value": notes, "inline": False})
+                
+                fields.append({"name": "Next Steps", "value": "Your order is now paid and will be processed soon!", "inline": False})
+                
+                embed = discord.Embed.from_dict({
+                    **_PAYMENT_CONFIRMED_EMBED,
+                    "description": f"Your payment for order {order.order_number} has been confirmed!",
+                    "fields": fields
+                })
+                self._notify_user(order.user_id, embed, "payment confirmation")
                 
                 # Confirmation message
-                await interaction.response.send_message(f"✅ Payment confirmed for order {order['order_number']}! User has been notified.", ephemeral=True)
+                await interaction.followup.send(f"✅ Payment confirmed for order {order.order_number}! User has been notified.", ephemeral=True)
                 
             else:
-                await interaction.response.send_message("❌ Failed to confirm payment. Please try again.", ephemeral=True)
+                await interaction.followup.send("❌ Failed to confirm payment. Please try again.", ephemeral=True)
                 
         except Exception as e:
-            logger.error(f"Error confirming payment: {e}")
-            await interaction.response.send_message("❌ An error occurred while confirming payment.", ephemeral=True)
+            logger.error("Error confirming payment: %s", e)
+            await interaction.followup.send("❌ An error occurred while confirming payment.", ephemeral=True)
     
     @app_commands.command(name="update_order_status", description="Update order status (Admin/Mod only)")
     @app_commands.describe(
@@ -291,72 +465,67 @@ class AdminOrderCog(commands.Cog):
         app_commands.Choice(name="Completed", value="Completed"),
         app_commands.Choice(name="Cancelled", value="Cancelled")
     ])
+    @app_commands.checks.cooldown(1, ADMIN_MUTATION_COOLDOWN)
     async def update_order_status(self, interaction: discord.Interaction, order_number: str, status: str, notes: Optional[str] = None):
         """Update order status"""
+        order_number = order_number.upper()
         if not self.is_admin_or_mod(interaction.user):
             await interaction.response.send_message("❌ You don't have permission to use this command!", ephemeral=True)
             return
         
-        logger.info(f"Status update attempt for {order_number} to {status} by {interaction.user}")
+        logger.info("Status update attempt for %s to %s by %s", order_number, status, interaction.user)
+        
+        await interaction.response.defer(ephemeral=True)
         
         try:
-            order = await self.order_manager.get_order(order_number.upper())
+            order = await self.order_manager.get_order(order_number)
             
             if not order:
-                await interaction.response.send_message("❌ Order not found!", ephemeral=True)
+                await interaction.followup.send("❌ Order not found!", ephemeral=True)
                 return
             
-            if order["status"] == status:
-                await interaction.response.send_message(f"❌ Order is already {status}!", ephemeral=True)
+            if order.status == status:
+                await interaction.followup.send(f"❌ Order is already {status}!", ephemeral=True)
                 return
             
             # Update order status
             success = await self.order_manager.update_order_status(
-                order_number.upper(),
-                OrderStatus(status),
+                order_number,
+                OrderStatus[status.upper()],
                 interaction.user.display_name,
                 notes or f"Status updated to {status}"
             )
             
             if success:
+                _invalidate_order_caches(order.user_id)
+                
                 # Notify user
-                try:
-                    user = await self.bot.fetch_user(int(order["user_id"]))
-                    if user:
-                        status_emoji = {
-                            "Pending": "🟡",
-                            "Paid": "🟢",
-                            "Processing": "🔄",
-                            "Completed": "✅",
-                            "Cancelled": "❌"
-                        }.get(status, "⚪")
-                        
-                        embed = discord.Embed(
-                            title="📋 Order Status Updated",
-                            description=f"Your order {order['order_number']} status has been updated!",
-                            color=discord.Color.blue()
-                        )
-                        embed.add_field(name="Order Number", value=order["order_number"], inline=True)
-                        embed.add_field(name="Product", value=order["product_name"], inline=True)
-                        embed.add_field(name="New Status", value=f"{status_emoji} {status}", inline=True)
-                        embed.add_field(name="Updated By", value=interaction.user.display_name, inline=True)
-                        
-                        if notes:
-                            embed.add_field(name="Notes", value=notes, inline=False)
-                        
-                        await user.send(embed=embed)
-                except Exception as e:
-                    logger.warning(f"Could not notify user about status update: {e}")
+                fields = [
+                    {"name": "Order Number", "value": order.order_number, "inline": True},
+                    {"name": "Product", "value": order.product_name, "inline": True},
+                    {"name": "New Status", "value": STATUS_LABELS.get(status, f"⚪ {status}"), "inline": True},
+                    {"name": "Updated By", "value": interaction.user.display_name, "inline": True}
+                ]
+                
+                if notes:
+                    fields.append({"name": "Notes", "value": notes, "inline": False})
+                
+                embed = discord.Embed.from_dict({
+                    **_STATUS_UPDATED_EMBED,
+                    "description": f"Your order {order.order_number} status has been updated!",
+                    "fields": fields
+                })
+                self._notify_user(order.user_id, embed, "status update")
                 
                 # Confirmation message
-                await interaction.response.send_message(f"✅ Order {order['order_number']} status updated to {status}! User has been notified.", ephemeral=True)
+                await interaction.followup.send(f"✅ Order {order.order_number} status updated to {status}! User has been notified.", ephemeral=True)
                 
             else:
-                await interaction.response.send_message("❌ Failed to update order status. Please try again.", ephemeral=True)
+                await interaction.followup.send("❌ Failed to update order status. Please try again.", ephemeral=True)
                 
         except Exception as e:
-            logger.error(f"Error updating order status: {e}")
-            await interaction.response.send_message("❌ An error occurred while updating the order status.", ephemeral=True)
+            logger.error("Error updating order status: %s", e)
+            await interaction.followup.send("❌ An error occurred while updating the order status.", ephemeral=True)
     
     @app_commands.command(name="view_orders", description="View all orders (Admin/Mod only)")
     @app_commands.describe(
@@ -377,7 +546,9 @@ class AdminOrderCog(commands.Cog):
             await interaction.response.send_message("❌ You don't have permission to use this command!", ephemeral=True)
             return
         
-        logger.info(f"Order view request by {interaction.user} with status filter: {status}")
+        logger.info("Order view request by %s with status filter: %s", interaction.user, status)
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
         
         try:
             status_filter = None if status == "all" else status
@@ -389,35 +560,19 @@ class AdminOrderCog(commands.Cog):
                     description="No orders found matching your criteria.",
                     color=discord.Color.blue()
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await interaction.edit_original_response(embed=embed)
                 return
             
-            embed = discord.Embed(
+            paginator = OrdersPaginator(
+                orders,
                 title="📦 Orders Management",
-                description=f"Showing {len(orders)} order(s)" + (f" with status: {status}" if status != "all" else ""),
-                color=discord.Color.blue()
+                description=f"Showing {len(orders)} order(s)" + (f" with status: {status}" if status != "all" else "")
             )
-            
-            for order in orders:
-                status_emoji = {
-                    "Pending": "🟡",
-                    "Paid": "🟢",
-                    "Processing": "🔄",
-                    "Completed": "✅",
-                    "Cancelled": "❌"
-                }.get(order["status"], "⚪")
-                
-                embed.add_field(
-                    name=f"{order['order_number']} - {order['username']}",
-                    value=f"Product: {order['product_name']}\nQty: {order['quantity']}\nStatus: {status_emoji} {order['status']}\nCreated: <t:{int(datetime.fromisoformat(order['created_at']).timestamp())}:R>",
-                    inline=True
-                )
-            
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await paginator.send(interaction)
             
         except Exception as e:
-            logger.error(f"Error viewing orders: {e}")
-            await interaction.response.send_message("❌ An error occurred while retrieving orders.", ephemeral=True)
+            logger.error("Error viewing orders: %s", e)
+            await interaction.edit_original_response(content="❌ An error occurred while retrieving orders.")
     
     @app_commands.command(name="search_orders", description="Search orders (Admin/Mod only)")
     @app_commands.describe(query="Search term (order number, username, or product name)")
@@ -427,7 +582,9 @@ class AdminOrderCog(commands.Cog):
             await interaction.response.send_message("❌ You don't have permission to use this command!", ephemeral=True)
             return
         
-        logger.info(f"Order search by {interaction.user} with query: {query}")
+        logger.info("Order search by %s with query: %s", interaction.user, query)
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
         
         try:
             orders = await self.order_manager.search_orders(query=query, limit=15)
@@ -438,35 +595,19 @@ class AdminOrderCog(commands.Cog):
                     description=f"No orders found matching '{query}'.",
                     color=discord.Color.blue()
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await interaction.edit_original_response(embed=embed)
                 return
             
-            embed = discord.Embed(
+            paginator = OrdersPaginator(
+                orders,
                 title="🔍 Search Results",
-                description=f"Found {len(orders)} order(s) matching '{query}'",
-                color=discord.Color.blue()
+                description=f"Found {len(orders)} order(s) matching '{query}'"
             )
-            
-            for order in orders:
-                status_emoji = {
-                    "Pending": "🟡",
-                    "Paid": "🟢",
-                    "Processing": "🔄",
-                    "Completed": "✅",
-                    "Cancelled": "❌"
-                }.get(order["status"], "⚪")
-                
-                embed.add_field(
-                    name=f"{order['order_number']} - {order['username']}",
-                    value=f"Product: {order['product_name']}\nQty: {order['quantity']}\nStatus: {status_emoji} {order['status']}\nCreated: <t:{int(datetime.fromisoformat(order['created_at']).timestamp())}:R>",
-                    inline=True
-                )
-            
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await paginator.send(interaction)
             
         except Exception as e:
-            logger.error(f"Error searching orders: {e}")
-            await interaction.response.send_message("❌ An error occurred while searching orders.", ephemeral=True)
+            logger.error("Error searching orders: %s", e)
+            await interaction.edit_original_response(content="❌ An error occurred while searching orders.")
     
     @app_commands.command(name="order_report", description="Generate order statistics report (Admin/Mod only)")
     async def order_report(self, interaction: discord.Interaction):
@@ -475,10 +616,18 @@ class AdminOrderCog(commands.Cog):
             await interaction.response.send_message("❌ You don't have permission to use this command!", ephemeral=True)
             return
         
-        logger.info(f"Order report requested by {interaction.user}")
+        logger.info("Order report requested by %s", interaction.user)
+        
+        await interaction.response.defer(ephemeral=True)
         
         try:
-            stats = await self.order_manager.get_order_stats()
+            now = time.monotonic()
+            if _stats_cache["data"] is not None and now - _stats_cache["ts"] < STATS_CACHE_TTL:
+                stats = _stats_cache["data"]
+            else:
+                stats = await self.order_manager.get_order_stats()
+                _stats_cache["ts"] = now
+                _stats_cache["data"] = stats
             
             embed = discord.Embed(
                 title="📊 Order Statistics Report",
@@ -494,24 +643,18 @@ class AdminOrderCog(commands.Cog):
             status_counts = stats["status_counts"]
             status_text = ""
             for status, count in status_counts.items():
-                status_emoji = {
-                    "Pending": "🟡",
-                    "Paid": "🟢",
-                    "Processing": "🔄",
-                    "Completed": "✅",
-                    "Cancelled": "❌"
-                }.get(status, "⚪")
+                status_emoji = STATUS_EMOJI.get(status, "⚪")
                 status_text += f"{status_emoji} {status}: {count}\n"
             
             embed.add_field(name="📋 Orders by Status", value=status_text or "No orders yet", inline=False)
             
             embed.set_footer(text=f"Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
         except Exception as e:
-            logger.error(f"Error generating order report: {e}")
-            await interaction.response.send_message("❌ An error occurred while generating the report.", ephemeral=True)
+            logger.error("Error generating order report: %s", e)
+            await interaction.followup.send("❌ An error occurred while generating the report.", ephemeral=True)
 
 # Function to add all order cogs to the bot
 async def setup_order_cogs(bot):
@@ -7,281 +7,581 @@ import aiosqlite
 import asyncio
 import json
 import logging
-from datetime import datetime, timezone
-from typing import List, Dict, Optional, Any
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import List, Dict, Final, Optional, Any, Set, Tuple
 from pathlib import Path
-from enum import Enum
+from enum import IntEnum
+
+from aiosqlitepool import SQLiteConnectionPool
 
 logger = logging.getLogger(__name__)
 
-class OrderStatus(Enum):
-    PENDING = "Pending"
-    PAID = "Paid"
-    PROCESSING = "Processing"
-    COMPLETED = "Completed"
-    CANCELLED = "Cancelled"
+# WAL is persistent in the database file; the rest are per-connection settings
+_CONNECTION_PRAGMAS: Final = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-10000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+# Seconds create_order waits to collect concurrent orders into one transaction
+ORDER_BATCH_WINDOW: Final = 0.01
+# Orders kept in OrderManager's in-process LRU for get_order
+ORDER_CACHE_SIZE: Final = 1024
+# Orders created within this window count as recent in the stats
+RECENT_ORDERS_WINDOW_MS: Final = 7 * 86_400_000
+# Seconds between forced WAL checkpoints, so their cost never lands on a user's commit
+WAL_CHECKPOINT_INTERVAL: Final = 300
+
+# Display names of the statuses, indexed by the integer code stored in orders.status
+_STATUS_NAMES: Final = ("Pending", "Paid", "Processing", "Completed", "Cancelled")
+_STATUS_CODES: Final = {name: code for code, name in enumerate(_STATUS_NAMES)}
+
+class OrderStatus(IntEnum):
+    PENDING = 0
+    PAID = 1
+    PROCESSING = 2
+    COMPLETED = 3
+    CANCELLED = 4
+    
+    @property
+    def label(self) -> str:
+        """Display name of the status"""
+        return _STATUS_NAMES[self]
+
+STATUS_EMOJI: Final[Dict[str, str]] = {
+    "Pending": "🟡",
+    "Paid": "🟢",
+    "Processing": "🔄",
+    "Completed": "✅",
+    "Cancelled": "❌"
+}
+
+# Stored order columns, in OrderRow field order
+_ORDER_COLS: Final = (
+    "order_number", "user_id", "username", "product_name", "quantity", "status",
+    "payment_method", "created_at", "updated_at", "confirmed_by", "notes",
+)
+_ORDER_COLUMNS_SQL: Final = ", ".join(_ORDER_COLS)
+_STATUS_COL: Final = _ORDER_COLS.index("status")
+_ORDER_SELECT: Final = f"SELECT {_ORDER_COLUMNS_SQL} FROM orders"
+
+@dataclass(frozen=True, slots=True)
+class OrderRow:
+    """A single order; fields follow _ORDER_COLS, with timestamps in epoch milliseconds"""
+    order_number: str
+    user_id: str
+    username: str
+    product_name: str
+    quantity: int
+    status: str
+    payment_method: str
+    created_at: int
+    updated_at: int
+    confirmed_by: Optional[str]
+    notes: Optional[str]
+    # created_at in epoch seconds, and the Discord relative-time token for it, derived once per row
+    created_ts: int = field(init=False, repr=False, compare=False)
+    created_rel: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        created_ts = self.created_at // 1000
+        object.__setattr__(self, "created_ts", created_ts)
+        object.__setattr__(self, "created_rel", f"<t:{created_ts}:R>")
+    
+    @property
+    def status_emoji(self) -> str:
+        """Emoji shown next to the order's status"""
+        return STATUS_EMOJI.get(self.status, "⚪")
+
+def _now_ms() -> int:
+    """Current time in epoch milliseconds, the unit every timestamp column is stored in"""
+    return time.time_ns() // 1_000_000
+
+def _row_to_order(row: aiosqlite.Row) -> OrderRow:
+    """Build an OrderRow from a row selected with _ORDER_SELECT, naming its status code"""
+    values = list(row)
+    values[_STATUS_COL] = _STATUS_NAMES[values[_STATUS_COL]]
+    return OrderRow(*values)
+
+# SQL is kept in module constants so every call reuses the same statement text,
+# which the pooled connections' statement caches are keyed on
+_SQL_BEGIN: Final = "BEGIN IMMEDIATE"
+_SQL_COMMIT: Final = "COMMIT"
+_SQL_ROLLBACK: Final = "ROLLBACK"
+_ORDERS_TABLE_DDL: Final = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_number TEXT UNIQUE NOT NULL,
+        user_id TEXT NOT NULL,
+        username TEXT NOT NULL,
+        product_name TEXT NOT NULL,
+        quantity INTEGER NOT NULL,
+        status INTEGER NOT NULL CHECK(status BETWEEN 0 AND 4),
+        payment_method TEXT DEFAULT 'PayPal',
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL,
+        confirmed_by TEXT,
+        notes TEXT
+    )
+"""
+_SQL_CREATE_ORDERS: Final = _ORDERS_TABLE_DDL.format(table="orders")
+_SQL_CREATE_HISTORY: Final = """
+    CREATE TABLE IF NOT EXISTS order_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_number TEXT NOT NULL,
+        status_from TEXT NOT NULL,
+        status_to TEXT NOT NULL,
+        changed_by TEXT NOT NULL,
+        changed_at INTEGER NOT NULL,
+        notes TEXT
+    )
+"""
+# orders.order_number already has the implicit UNIQUE index
+_SQL_CREATE_INDEXES: Final = (
+    "CREATE INDEX IF NOT EXISTS idx_orders_user_created ON orders(user_id, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_history_order ON order_history(order_number, changed_at DESC)",
+)
+# Trigram-tokenized full-text index over the searchable columns, kept in sync by triggers;
+# trigrams give the same case-insensitive substring matching as LIKE '%query%'
+_SQL_CREATE_FTS: Final = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS orders_fts USING fts5(
+        order_number, username, product_name,
+        content='orders', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_fts_insert AFTER INSERT ON orders BEGIN
+        INSERT INTO orders_fts(rowid, order_number, username, product_name)
+        VALUES (new.id, new.order_number, new.username, new.product_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_fts_delete AFTER DELETE ON orders BEGIN
+        INSERT INTO orders_fts(orders_fts, rowid, order_number, username, product_name)
+        VALUES ('delete', old.id, old.order_number, old.username, old.product_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_fts_update
+    AFTER UPDATE OF order_number, username, product_name ON orders BEGIN
+        INSERT INTO orders_fts(orders_fts, rowid, order_number, username, product_name)
+        VALUES ('delete', old.id, old.order_number, old.username, old.product_name);
+        INSERT INTO orders_fts(rowid, order_number, username, product_name)
+        VALUES (new.id, new.order_number, new.username, new.product_name);
+    END
+    """,
+)
+# Upgrades for existing databases; migration N takes PRAGMA user_version from N to N + 1
+_SQL_MIGRATIONS: Final = (
+    # Timestamps move from ISO-8601 text to epoch-millisecond integers
+    tuple(
+        f"UPDATE {table} SET {column} = CAST(ROUND((julianday({column}) - 2440587.5) * 86400000) AS INTEGER) "
+        f"WHERE typeof({column}) = 'text'"
+        for table, column in (("orders", "created_at"), ("orders", "updated_at"), ("order_history", "changed_at"))
+    ),
+    # orders.status moves from its display name to an integer code; the column type
+    # changes, so the table is rebuilt (its indexes and triggers are recreated afterwards)
+    (
+        _ORDERS_TABLE_DDL.format(table="orders_v2"),
+        f"""
+        INSERT INTO orders_v2
+        SELECT id, order_number, user_id, username, product_name, quantity,
+               CASE status {' '.join(f"WHEN '{name}' THEN {code}" for name, code in _STATUS_CODES.items())} END,
+               payment_method, created_at, updated_at, confirmed_by, notes
+        FROM orders
+        """,
+        "DROP TABLE orders",
+        "ALTER TABLE orders_v2 RENAME TO orders",
+    ),
+)
+_SCHEMA_VERSION: Final = len(_SQL_MIGRATIONS)
+_SQL_GET_SCHEMA_VERSION: Final = "PRAGMA user_version"
+_SQL_SET_SCHEMA_VERSION: Final = f"PRAGMA user_version = {_SCHEMA_VERSION}"
+_SQL_EXISTING_TABLES: Final = "SELECT name FROM sqlite_master WHERE name IN ('orders', 'orders_fts')"
+_SQL_FTS_REBUILD: Final = "INSERT INTO orders_fts(orders_fts) VALUES ('rebuild')"
+_SQL_WAL_CHECKPOINT: Final = "PRAGMA wal_checkpoint(TRUNCATE)"
+# Last id AUTOINCREMENT handed out; there is no row until the first order is inserted
+_SQL_LAST_ORDER_ID: Final = "SELECT seq FROM sqlite_sequence WHERE name = 'orders'"
+_SQL_INSERT_ORDER: Final = """
+    INSERT INTO orders (id, order_number, user_id, username, product_name, quantity, status, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_HISTORY: Final = """
+    INSERT INTO order_history (order_number, status_from, status_to, changed_by, changed_at, notes)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_GET_ORDER: Final = _ORDER_SELECT + " WHERE order_number = ?"
+_SQL_ORDER_STATUS: Final = "SELECT status FROM orders WHERE order_number = ?"
+_SQL_UPDATE_STATUS: Final = """
+    UPDATE orders
+    SET status = ?, updated_at = ?, confirmed_by = ?, notes = ?
+    WHERE order_number = ?
+"""
+_SQL_USER_ORDERS: Final = _ORDER_SELECT + " WHERE user_id = ? ORDER BY created_at DESC, id DESC"
+# Trigram matching needs at least three characters; shorter queries fall back to LIKE
+FTS_MIN_QUERY_LENGTH: Final = 3
+_SEARCH_QUERY_FILTERS: Final = {
+    None: "",
+    "like": " AND (order_number LIKE ? OR username LIKE ? OR product_name LIKE ?)",
+    "fts": " AND id IN (SELECT rowid FROM orders_fts WHERE orders_fts MATCH ?)",
+}
+# One page of a user's orders plus their total order count as a trailing column
+_SQL_USER_ORDERS_PAGE: Final = f"""
+    SELECT {_ORDER_COLUMNS_SQL}, COUNT(*) OVER () AS total
+    FROM orders WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?
+"""
+# search_orders statements keyed by (query filter, has status filter)
+_SQL_SEARCH: Final = {
+    (query_filter, has_status): (
+        _ORDER_SELECT + " WHERE 1=1"
+        + _SEARCH_QUERY_FILTERS[query_filter]
+        + (" AND status = ?" if has_status else "")
+        + " ORDER BY created_at DESC, id DESC LIMIT ?"
+    )
+    for query_filter in _SEARCH_QUERY_FILTERS
+    for has_status in (False, True)
+}
+_SQL_HISTORY: Final = """
+    SELECT status_from, status_to, changed_by, changed_at, notes,
+           changed_at / 1000 AS changed_ts
+    FROM order_history WHERE order_number = ? ORDER BY changed_at DESC, id DESC
+"""
+# Per-status totals and counts since the bound cutoff from one scan; the overall figures are their sums
+_SQL_STATS: Final = """
+    SELECT status, COUNT(*), SUM(created_at >= ?)
+    FROM orders GROUP BY status
+"""
 
 class OrderManager:
     def __init__(self, db_path: str = "orders.db"):
-        self.db_path = Path(__file__).parent / db_path
+        # "file:" URIs (e.g. a shared in-memory database) are passed to SQLite as-is;
+        # plain paths are relative to the backend directory
+        self._uri = db_path.startswith("file:")
+        self.db_path = db_path if self._uri else Path(__file__).parent / db_path
         self.db_initialized = False
+        self._pool: Optional[SQLiteConnectionPool] = None
+        # Writes are serialized through one connection; reads go through the pool
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        # Orders waiting for the next batched insert, with the futures their callers await
+        self._pending_orders: List[Tuple[asyncio.Future, tuple]] = []
+        self._order_flush_task: Optional[asyncio.Task] = None
+        # Every flush still running, including ones that stopped accepting orders; close() awaits them
+        self._order_flush_tasks: Set[asyncio.Task] = set()
+        # order_number -> order, least recently used first; rows are immutable, so hits
+        # are shared as-is, and update_order_status drops the entry it changes
+        self._order_cache: "OrderedDict[str, OrderRow]" = OrderedDict()
+        # Bumped by every status change; a get_order miss only caches its row if no change
+        # committed while it was reading, so a row read before an update can't outlive it
+        self._order_cache_generation = 0
+    
+    async def _make_conn(self) -> aiosqlite.Connection:
+        """Open a pooled connection with the tuned PRAGMAs applied"""
+        # Autocommit mode: write transactions are opened explicitly with BEGIN IMMEDIATE,
+        # taking the write lock up front instead of upgrading from a read lock
+        db = await aiosqlite.connect(self.db_path, isolation_level=None, uri=self._uri)
+        db.row_factory = aiosqlite.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            await db.execute(pragma)
+        return db
+    
+    @asynccontextmanager
+    async def _connect(self):
+        """Borrow a connection from the pool, creating the pool on first use"""
+        if self._pool is None:
+            self._pool = SQLiteConnectionPool(connection_factory=self._make_conn, pool_size=5)
+        async with self._pool.connection() as db:
+            yield db
+    
+    @asynccontextmanager
+    async def _write(self):
+        """Hold the writer connection for one transaction, opening it on first use"""
+        async with self._writer_lock:
+            if self._writer is None:
+                self._writer = await self._make_conn()
+                self._checkpoint_task = asyncio.create_task(self._checkpoint_periodically())
+            try:
+                yield self._writer
+            except BaseException:
+                await self._writer.rollback()
+                raise
+    
+    async def _checkpoint_periodically(self):
+        """Truncate the WAL in the background every few minutes"""
+        while True:
+            await asyncio.sleep(WAL_CHECKPOINT_INTERVAL)
+            try:
+                async with self._connect() as db:
+                    await db.execute(_SQL_WAL_CHECKPOINT)
+            except Exception as e:
+                logger.warning("WAL checkpoint failed: %s", e)
+    
+    def _cache_order(self, order: OrderRow):
+        """Store an order as the most recently used cache entry, evicting the oldest past the limit"""
+        self._order_cache[order.order_number] = order
+        self._order_cache.move_to_end(order.order_number)
+        if len(self._order_cache) > ORDER_CACHE_SIZE:
+            self._order_cache.popitem(last=False)
+    
+    async def close(self):
+        """Close the writer and every pooled connection"""
+        # Let every queued order reach the database (or fail its caller) before the writer goes away
+        while self._order_flush_tasks:
+            await asyncio.gather(*self._order_flush_tasks)
+        if self._checkpoint_task is not None:
+            self._checkpoint_task.cancel()
+            self._checkpoint_task = None
+        async with self._writer_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
     
     async def initialize_db(self):
-        """Initialize the database with required tables"""
+        """Initialize the database with required tables; must be awaited once before any other method"""
         if self.db_initialized:
             return
             
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS orders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    order_number TEXT UNIQUE NOT NULL,
-                    user_id TEXT NOT NULL,
-                    username TEXT NOT NULL,
-                    product_name TEXT NOT NULL,
-                    quantity INTEGER NOT NULL,
-                    status TEXT NOT NULL,
-                    payment_method TEXT DEFAULT 'PayPal',
-                    created_at TIMESTAMP NOT NULL,
-                    updated_at TIMESTAMP NOT NULL,
-                    confirmed_by TEXT,
-                    notes TEXT
-                )
-            """)
+        async with self._write() as db:
+            # Create or upgrade the whole schema atomically
+            await db.execute(_SQL_BEGIN)
+            cursor = await db.execute(_SQL_EXISTING_TABLES)
+            existing = {row[0] for row in await cursor.fetchall()}
             
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS order_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    order_number TEXT NOT NULL,
-                    status_from TEXT NOT NULL,
-                    status_to TEXT NOT NULL,
-                    changed_by TEXT NOT NULL,
-                    changed_at TIMESTAMP NOT NULL,
-                    notes TEXT
-                )
-            """)
+            if "orders" in existing:
+                cursor = await db.execute(_SQL_GET_SCHEMA_VERSION)
+                schema_version = (await cursor.fetchone())[0]
+                for migration in _SQL_MIGRATIONS[schema_version:]:
+                    for statement in migration:
+                        await db.execute(statement)
             
-            await db.commit()
+            await db.execute(_SQL_CREATE_ORDERS)
+            await db.execute(_SQL_CREATE_HISTORY)
+            for statement in _SQL_CREATE_INDEXES:
+                await db.execute(statement)
+            
+            for statement in _SQL_CREATE_FTS:
+                await db.execute(statement)
+            if "orders_fts" not in existing:
+                # Index any orders written before the search table existed
+                await db.execute(_SQL_FTS_REBUILD)
+            
+            await db.execute(_SQL_SET_SCHEMA_VERSION)
+            await db.execute(_SQL_COMMIT)
             logger.info("Database initialized successfully")
             self.db_initialized = True
     
     async def generate_order_number(self) -> str:
         """Generate next order number in format ORD-001"""
-        await self.initialize_db()
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
         
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("SELECT MAX(id) FROM orders")
+        async with self._connect() as db:
+            cursor = await db.execute(_SQL_LAST_ORDER_ID)
             result = await cursor.fetchone()
-            next_id = (result[0] or 0) + 1
+            next_id = (result[0] if result else 0) + 1
             return f"ORD-{next_id:03d}"
     
-    async def create_order(self, user_id: str, username: str, product_name: str, quantity: int) -> Dict[str, Any]:
+    async def create_order(self, user_id: str, username: str, product_name: str, quantity: int) -> OrderRow:
         """Create a new order"""
-        await self.initialize_db()
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
         
-        order_number = await self.generate_order_number()
-        now = datetime.now(timezone.utc)
+        # Orders arriving together are committed in one transaction by _flush_pending_orders
+        future = asyncio.get_running_loop().create_future()
+        self._pending_orders.append((future, (user_id, username, product_name, quantity, _now_ms())))
+        if self._order_flush_task is None:
+            self._order_flush_task = asyncio.create_task(self._flush_pending_orders())
+            self._order_flush_tasks.add(self._order_flush_task)
+            self._order_flush_task.add_done_callback(self._order_flush_tasks.discard)
+        return await future
+    
+    async def _flush_pending_orders(self):
+        """Insert every queued order and its history entry in a single transaction"""
+        await asyncio.sleep(ORDER_BATCH_WINDOW)
+        batch, self._pending_orders = self._pending_orders, []
+        self._order_flush_task = None
         
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT INTO orders (order_number, user_id, username, product_name, quantity, status, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (order_number, user_id, username, product_name, quantity, OrderStatus.PENDING.value, now, now))
-            
-            # Add to history
-            await db.execute("""
-                INSERT INTO order_history (order_number, status_from, status_to, changed_by, changed_at, notes)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (order_number, "None", OrderStatus.PENDING.value, username, now, "Order created"))
-            
-            await db.commit()
-            
-            logger.info(f"Created order {order_number} for user {username}")
-            
-            return {
-                "order_number": order_number,
-                "user_id": user_id,
-                "username": username,
-                "product_name": product_name,
-                "quantity": quantity,
-                "status": OrderStatus.PENDING.value,
-                "created_at": now.isoformat(),
-                "payment_method": "PayPal"
-            }
+        orders = []
+        try:
+            async with self._write() as db:
+                await db.execute(_SQL_BEGIN)
+                # The write lock is held, so the ids after the last one handed out are ours
+                cursor = await db.execute(_SQL_LAST_ORDER_ID)
+                row = await cursor.fetchone()
+                await cursor.close()
+                last_id = row[0] if row else 0
+                
+                order_params = []
+                history_params = []
+                for order_id, (_, (user_id, username, product_name, quantity, now)) in enumerate(batch, last_id + 1):
+                    order_number = f"ORD-{order_id:03d}"
+                    order_params.append((order_id, order_number, user_id, username, product_name, quantity, OrderStatus.PENDING, now, now))
+                    history_params.append((order_number, "None", OrderStatus.PENDING.label, username, now, "Order created"))
+                    orders.append(OrderRow(
+                        order_number=order_number,
+                        user_id=user_id,
+                        username=username,
+                        product_name=product_name,
+                        quantity=quantity,
+                        status=OrderStatus.PENDING.label,
+                        payment_method="PayPal",
+                        created_at=now,
+                        updated_at=now,
+                        confirmed_by=None,
+                        notes=None
+                    ))
+                
+                await db.executemany(_SQL_INSERT_ORDER, order_params)
+                await db.executemany(_SQL_INSERT_HISTORY, history_params)
+                await db.execute(_SQL_COMMIT)
+        except Exception as e:
+            for future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (future, _), order in zip(batch, orders):
+            logger.info("Created order %s for user %s", order.order_number, order.username)
+            self._cache_order(order)
+            if not future.done():
+                future.set_result(order)
     
-    async def get_order(self, order_number: str) -> Optional[Dict[str, Any]]:
+    async def get_order(self, order_number: str) -> Optional[OrderRow]:
         """Get order details by order number"""
-        await self.initialize_db()
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
         
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("""
-                SELECT order_number, user_id, username, product_name, quantity, status, payment_method, 
-                       created_at, updated_at, confirmed_by, notes
-                FROM orders WHERE order_number = ?
-            """, (order_number,))
-            
+        order = self._order_cache.get(order_number)
+        if order is not None:
+            self._order_cache.move_to_end(order_number)
+            return order
+        
+        generation = self._order_cache_generation
+        async with self._connect() as db:
+            cursor = await db.execute(_SQL_GET_ORDER, (order_number,))
             row = await cursor.fetchone()
-            if not row:
-                return None
-            
-            return {
-                "order_number": row[0],
-                "user_id": row[1],
-                "username": row[2],
-                "product_name": row[3],
-                "quantity": row[4],
-                "status": row[5],
-                "payment_method": row[6],
-                "created_at": row[7],
-                "updated_at": row[8],
-                "confirmed_by": row[9],
-                "notes": row[10]
-            }
+        
+        if not row:
+            return None
+        
+        order = _row_to_order(row)
+        if generation == self._order_cache_generation:
+            self._cache_order(order)
+        return order
     
-    async def get_user_orders(self, user_id: str) -> List[Dict[str, Any]]:
+    async def get_user_orders(self, user_id: str) -> List[OrderRow]:
         """Get all orders for a specific user"""
-        await self.initialize_db()
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
         
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("""
-                SELECT order_number, user_id, username, product_name, quantity, status, payment_method, 
-                       created_at, updated_at, confirmed_by, notes
-                FROM orders WHERE user_id = ? ORDER BY created_at DESC
-            """, (user_id,))
+        async with self._connect() as db:
+            cursor = await db.execute(_SQL_USER_ORDERS, (user_id,))
             
             rows = await cursor.fetchall()
-            return [
-                {
-                    "order_number": row[0],
-                    "user_id": row[1],
-                    "username": row[2],
-                    "product_name": row[3],
-                    "quantity": row[4],
-                    "status": row[5],
-                    "payment_method": row[6],
-                    "created_at": row[7],
-                    "updated_at": row[8],
-                    "confirmed_by": row[9],
-                    "notes": row[10]
-                }
-                for row in rows
-            ]
+            return [_row_to_order(row) for row in rows]
+    
+    async def get_user_orders_page(self, user_id: str, offset: int = 0, limit: int = 5) -> Tuple[List[OrderRow], int]:
+        """Get one page of a user's orders, newest first, with their total order count"""
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
+        
+        async with self._connect() as db:
+            cursor = await db.execute(_SQL_USER_ORDERS_PAGE, (user_id, limit, offset))
+            rows = await cursor.fetchall()
+            
+            total = rows[0]["total"] if rows else 0
+            return [_row_to_order(row[:-1]) for row in rows], total
     
     async def update_order_status(self, order_number: str, new_status: OrderStatus, changed_by: str, notes: str = None) -> bool:
         """Update order status"""
-        await self.initialize_db()
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
         
-        # Get current order
-        current_order = await self.get_order(order_number)
-        if not current_order:
-            return False
+        now = _now_ms()
         
-        old_status = current_order["status"]
-        now = datetime.now(timezone.utc)
-        
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
+            # Read and write under one write lock so the recorded previous status
+            # can't go stale between the two
+            await db.execute(_SQL_BEGIN)
+            cursor = await db.execute(_SQL_ORDER_STATUS, (order_number,))
+            row = await cursor.fetchone()
+            await cursor.close()
+            if not row:
+                await db.execute(_SQL_ROLLBACK)
+                return False
+            
+            old_status = _STATUS_NAMES[row[0]]
+            
             # Update order
-            await db.execute("""
-                UPDATE orders 
-                SET status = ?, updated_at = ?, confirmed_by = ?, notes = ?
-                WHERE order_number = ?
-            """, (new_status.value, now, changed_by, notes, order_number))
+            await db.execute(_SQL_UPDATE_STATUS, (new_status, now, changed_by, notes, order_number))
             
             # Add to history
-            await db.execute("""
-                INSERT INTO order_history (order_number, status_from, status_to, changed_by, changed_at, notes)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (order_number, old_status, new_status.value, changed_by, now, notes or f"Status changed to {new_status.value}"))
+            await db.execute(_SQL_INSERT_HISTORY, (order_number, old_status, new_status.label, changed_by, now, notes or f"Status changed to {new_status.label}"))
             
-            await db.commit()
+            await db.execute(_SQL_COMMIT)
+            self._order_cache_generation += 1
+            self._order_cache.pop(order_number, None)
             
-            logger.info(f"Updated order {order_number} from {old_status} to {new_status.value} by {changed_by}")
+            logger.info("Updated order %s from %s to %s by %s", order_number, old_status, new_status.label, changed_by)
             return True
     
-    async def search_orders(self, query: str = None, status: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+    async def search_orders(self, query: str = None, status: str = None, limit: int = 50) -> List[OrderRow]:
         """Search orders with optional filters"""
-        await self.initialize_db()
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
         
-        sql = """
-            SELECT order_number, user_id, username, product_name, quantity, status, payment_method, 
-                   created_at, updated_at, confirmed_by, notes
-            FROM orders WHERE 1=1
-        """
         params = []
         
-        if query:
-            sql += " AND (order_number LIKE ? OR username LIKE ? OR product_name LIKE ?)"
+        if not query:
+            query_filter = None
+        elif len(query) >= FTS_MIN_QUERY_LENGTH:
+            query_filter = "fts"
+            # Quote the query as a single FTS5 phrase so its characters are matched literally
+            params.append('"' + query.replace('"', '""') + '"')
+        else:
+            query_filter = "like"
             params.extend([f"%{query}%", f"%{query}%", f"%{query}%"])
+        sql = _SQL_SEARCH[query_filter, bool(status)]
         
         if status:
-            sql += " AND status = ?"
-            params.append(status)
+            params.append(_STATUS_CODES.get(status))
         
-        sql += " ORDER BY created_at DESC LIMIT ?"
         params.append(limit)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             cursor = await db.execute(sql, params)
             rows = await cursor.fetchall()
             
-            return [
-                {
-                    "order_number": row[0],
-                    "user_id": row[1],
-                    "username": row[2],
-                    "product_name": row[3],
-                    "quantity": row[4],
-                    "status": row[5],
-                    "payment_method": row[6],
-                    "created_at": row[7],
-                    "updated_at": row[8],
-                    "confirmed_by": row[9],
-                    "notes": row[10]
-                }
-                for row in rows
-            ]
+            return [_row_to_order(row) for row in rows]
     
     async def get_order_history(self, order_number: str) -> List[Dict[str, Any]]:
         """Get order status history"""
-        await self.initialize_db()
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
         
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("""
-                SELECT status_from, status_to, changed_by, changed_at, notes
-                FROM order_history WHERE order_number = ? ORDER BY changed_at DESC
-            """, (order_number,))
+        async with self._connect() as db:
+            cursor = await db.execute(_SQL_HISTORY, (order_number,))
             
             rows = await cursor.fetchall()
-            return [
-                {
-                    "status_from": row[0],
-                    "status_to": row[1],
-                    "changed_by": row[2],
-                    "changed_at": row[3],
-                    "notes": row[4]
-                }
-                for row in rows
-            ]
+            return [dict(row) for row in rows]
     
     async def get_order_stats(self) -> Dict[str, Any]:
         """Get order statistics for reports"""
-        await self.initialize_db()
+        assert self.db_initialized, "initialize_db() must be awaited at startup"
         
-        async with aiosqlite.connect(self.db_path) as db:
-            # Total orders
-            cursor = await db.execute("SELECT COUNT(*) FROM orders")
-            total_orders = (await cursor.fetchone())[0]
-            
-            # Orders by status
-            cursor = await db.execute("SELECT status, COUNT(*) FROM orders GROUP BY status")
-            status_counts = {row[0]: row[1] for row in await cursor.fetchall()}
+        async with self._connect() as db:
+            recent_cutoff = _now_ms() - RECENT_ORDERS_WINDOW_MS
+            cursor = await db.execute(_SQL_STATS, (recent_cutoff,))
+            rows = await cursor.fetchall()
             
-            # Recent orders (last 7 days)
-            cursor = await db.execute("""
-                SELECT COUNT(*) FROM orders 
-                WHERE created_at >= datetime('now', '-7 days')
-            """)
-            recent_orders = (await cursor.fetchone())[0]
+            status_counts = {_STATUS_NAMES[row[0]]: row[1] for row in rows}
+            total_orders = sum(status_counts.values())
+            recent_orders = sum(row[2] for row in rows)
             
             return {
                 "total_orders": total_orders,
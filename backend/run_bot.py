@@ -12,13 +12,16 @@ from pathlib import Path
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from discord_bot import main
+from dotenv import load_dotenv
+
+from discord_bot import ROOT_DIR, event_loop_factory, main
 
 if __name__ == "__main__":
     print("🤖 Starting Discord Bot...")
     print("=" * 50)
     
     # Check if token is present
+    load_dotenv(ROOT_DIR / '.env')
     token = os.getenv('DISCORD_BOT_TOKEN')
     if not token:
         print("❌ Error: DISCORD_BOT_TOKEN not found in environment variables!")
@@ -30,7 +33,8 @@ if __name__ == "__main__":
     print("=" * 50)
     
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=event_loop_factory()) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         print("\n👋 Bot stopped by user")
     except Exception as e:
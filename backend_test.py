@@ -5,37 +5,155 @@ This file tests the Discord bot implementation without connecting to Discord.
 """
 
 import unittest
-import os
 import sys
-import json
+import orjson
+import re
 import asyncio
+import sqlite3
 import tempfile
+import importlib
+import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
-from unittest.mock import patch, MagicMock, AsyncMock
+from types import SimpleNamespace
+from dataclasses import replace
+from unittest.mock import patch, call, MagicMock, AsyncMock
 
 # Add backend directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'backend'))
 
+def _async_return(value):
+    """MagicMock whose call returns an already-resolved future, awaitable like a coroutine mock"""
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return MagicMock(return_value=future)
+
+# place_order arguments that fail validation, with the reply each one should get
+PLACE_ORDER_VALIDATION_CASES = (
+    # Invalid quantity
+    ("Test Product", 0, call("❌ Quantity must be a positive number!", ephemeral=True)),
+    # Too large quantity
+    ("Test Product", 101, call("❌ Quantity cannot exceed 100 items per order!", ephemeral=True)),
+    # Invalid product name
+    (" ", 1, call("❌ Product name must be at least 2 characters!", ephemeral=True)),
+)
+
+# Source fragments each backend file must contain, with the message reported when one is missing
+EXPECTED_SOURCE = {
+    'discord_bot.py': {
+        # Check for key class and function definitions
+        'class DiscordBot(commands.Bot):': "DiscordBot class should be defined",
+        'class BotConfig:': "BotConfig class should be defined",
+        'bot = DiscordBot()': "bot instance should be created",
+        'async def main():': "main function should be defined",
+
+        # Check for key functionality
+        'async def on_message': "on_message handler should be defined",
+        'async def on_ready': "on_ready handler should be defined",
+        'async def setup_hook': "setup_hook should be defined",
+        'DISCORD_BOT_TOKEN': "Bot should use DISCORD_BOT_TOKEN",
+
+        # Check for order system integration
+        'from order_manager import order_manager': "Order manager should be imported",
+        'await order_manager.initialize_db()': "Order database should be initialized",
+        'from order_cogs import setup_order_cogs': "Order cogs should be imported",
+        'await setup_order_cogs(self)': "Order cogs should be set up",
+
+        # Check for order-related keywords
+        '"order":': "Order keyword should be defined",
+        '"payment":': "Payment keyword should be defined",
+        '"status":': "Status keyword should be defined",
+
+        # Check for order commands in help
+        'Order Commands': "Order commands should be in help",
+        'place_order': "place_order command should be in help",
+        'my_orders': "my_orders command should be in help",
+        'order_status': "order_status command should be in help",
+        'Admin Commands': "Admin commands should be in help",
+        'confirm_payment': "confirm_payment command should be in help",
+        'update_order_status': "update_order_status command should be in help",
+
+        # Check for command definitions
+        '@bot.tree.command(name="help"': "help command should be defined",
+        '@bot.tree.command(name="ping"': "ping command should be defined",
+    },
+    'bot_cogs.py': {
+        # Check for key class definitions
+        'class GeneralCog(commands.Cog):': "GeneralCog class should be defined",
+        'class NavigationCog(commands.Cog):': "NavigationCog class should be defined",
+        'class AdminCog(commands.Cog):': "AdminCog class should be defined",
+
+        # Check for setup function
+        'async def setup_cogs(bot):': "setup_cogs function should be defined",
+
+        # Check for key command definitions
+        '@app_commands.command(name="bot_help"': "bot_help command should be defined",
+        '@app_commands.command(name="ping"': "ping command should be defined",
+        '@app_commands.command(name="rules"': "rules command should be defined",
+        '@app_commands.command(name="join"': "join command should be defined",
+    },
+    'order_cogs.py': {
+        # Check for key class definitions
+        'class OrderCog(commands.Cog):': "OrderCog class should be defined",
+        'class AdminOrderCog(commands.Cog):': "AdminOrderCog class should be defined",
+
+        # Check for setup function
+        'async def setup_order_cogs(bot):': "setup_order_cogs function should be defined",
+
+        # Check for user commands
+        '@app_commands.command(name="place_order"': "place_order command should be defined",
+        '@app_commands.command(name="my_orders"': "my_orders command should be defined",
+        '@app_commands.command(name="order_status"': "order_status command should be defined",
+
+        # Check for admin commands
+        '@app_commands.command(name="confirm_payment"': "confirm_payment command should be defined",
+        '@app_commands.command(name="update_order_status"': "update_order_status command should be defined",
+        '@app_commands.command(name="view_orders"': "view_orders command should be defined",
+        '@app_commands.command(name="search_orders"': "search_orders command should be defined",
+        '@app_commands.command(name="order_report"': "order_report command should be defined",
+
+        # Check for admin permission checks
+        'def is_admin_or_mod': "is_admin_or_mod function should be defined",
+        'if not self.is_admin_or_mod': "Admin commands should check permissions",
+    },
+}
+
 class DiscordBotTests(unittest.TestCase):
     """Test suite for Discord bot implementation"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Read the backend sources and config checked by the tests once for the whole class"""
+        cls.backend_dir = Path(__file__).parent / 'backend'
+        for name in (*EXPECTED_SOURCE, 'bot_config.py'):
+            assert (cls.backend_dir / name).is_file(), f"{name} should exist"
+        cls._src = {name: (cls.backend_dir / name).read_text() for name in EXPECTED_SOURCE}
+
+        config_file = cls.backend_dir / 'bot_config.json'
+        cls._cfg = orjson.loads(config_file.read_bytes()) if config_file.is_file() else None
+
+        # Parse .env and import the runtime dependencies once rather than in every test
+        from dotenv import dotenv_values
+        cls._env = dotenv_values(cls.backend_dir / '.env')
+        try:
+            import discord
+            import aiosqlite
+            from discord.ext import commands
+            from discord import app_commands
+            cls._discord, cls._aiosqlite, cls._import_error = discord, aiosqlite, None
+        except ImportError as e:
+            cls._discord = cls._aiosqlite = None
+            cls._import_error = e
+
     def setUp(self):
         """Set up test environment"""
-        # Ensure we're working with the backend directory
-        self.backend_dir = Path(__file__).parent / 'backend'
-        os.chdir(self.backend_dir)
-        
         # Check if .env file exists
         self.env_file = self.backend_dir / '.env'
         self.assertTrue(self.env_file.exists(), "The .env file is missing")
 
     def test_bot_token_exists(self):
         """Test if the Discord bot token is properly configured in .env"""
-        # Import dotenv here to load environment variables
-        from dotenv import load_dotenv
-        load_dotenv(self.env_file)
-        
-        token = os.getenv('DISCORD_BOT_TOKEN')
+        token = self._env.get('DISCORD_BOT_TOKEN')
         self.assertIsNotNone(token, "DISCORD_BOT_TOKEN not found in .env file")
         self.assertTrue(len(token) > 0, "DISCORD_BOT_TOKEN is empty")
         
@@ -45,20 +163,14 @@ class DiscordBotTests(unittest.TestCase):
 
     def test_dependencies_installed(self):
         """Test if required dependencies are installed"""
-        try:
-            import discord
-            from discord.ext import commands
-            from discord import app_commands
-            import aiosqlite
-            
-            # Check discord.py version
-            self.assertTrue(discord.__version__ >= "2.3.0", "discord.py version should be at least 2.3.0")
-            
-            # Check aiosqlite is installed for order database
-            self.assertTrue(hasattr(aiosqlite, "connect"), "aiosqlite should have connect method")
-            
-        except ImportError as e:
-            self.fail(f"Required dependency not installed: {e}")
+        if self._import_error is not None:
+            self.fail(f"Required dependency not installed: {self._import_error}")
+
+        # Check discord.py version
+        self.assertTrue(self._discord.__version__ >= "2.3.0", "discord.py version should be at least 2.3.0")
+
+        # Check aiosqlite is installed for order database
+        self.assertTrue(hasattr(self._aiosqlite, "connect"), "aiosqlite should have connect method")
 
     def test_bot_config_structure(self):
         """Test the bot configuration management system"""
@@ -82,10 +194,8 @@ class DiscordBotTests(unittest.TestCase):
             self.assertIn("admin_roles", order_settings, "Order settings should contain admin_roles")
             
             # Test if default config file is created
-            config_file = self.backend_dir / "bot_config.json"
-            if config_file.exists():
-                with open(config_file, 'r') as f:
-                    config_data = json.load(f)
+            config_data = self._cfg
+            if config_data is not None:
                 self.assertIn("keywords_responses", config_data, "Config should contain keywords_responses")
                 self.assertIn("channels", config_data, "Config should contain channels")
                 self.assertIn("settings", config_data, "Config should contain settings")
@@ -96,122 +206,29 @@ class DiscordBotTests(unittest.TestCase):
         except Exception as e:
             self.fail(f"Error testing bot_config: {e}")
 
-    def test_discord_bot_structure(self):
-        """Test the Discord bot main file structure"""
-        try:
-            # Instead of importing and testing objects directly, let's check the file content
-            discord_bot_file = self.backend_dir / 'discord_bot.py'
-            self.assertTrue(discord_bot_file.exists(), "discord_bot.py should exist")
-            
-            with open(discord_bot_file, 'r') as f:
-                content = f.read()
-                
-                # Check for key class and function definitions
-                self.assertIn('class DiscordBot(commands.Bot):', content, "DiscordBot class should be defined")
-                self.assertIn('class BotConfig:', content, "BotConfig class should be defined")
-                self.assertIn('bot = DiscordBot()', content, "bot instance should be created")
-                self.assertIn('async def main():', content, "main function should be defined")
-                
-                # Check for key functionality
-                self.assertIn('async def on_message', content, "on_message handler should be defined")
-                self.assertIn('async def on_ready', content, "on_ready handler should be defined")
-                self.assertIn('async def setup_hook', content, "setup_hook should be defined")
-                self.assertIn('DISCORD_BOT_TOKEN', content, "Bot should use DISCORD_BOT_TOKEN")
-                
-                # Check for order system integration
-                self.assertIn('from order_manager import order_manager', content, "Order manager should be imported")
-                self.assertIn('await order_manager.initialize_db()', content, "Order database should be initialized")
-                self.assertIn('from order_cogs import setup_order_cogs', content, "Order cogs should be imported")
-                self.assertIn('await setup_order_cogs(self)', content, "Order cogs should be set up")
-                
-                # Check for order-related keywords
-                self.assertIn('"order":', content, "Order keyword should be defined")
-                self.assertIn('"payment":', content, "Payment keyword should be defined")
-                self.assertIn('"status":', content, "Status keyword should be defined")
-                
-                # Check for order commands in help
-                self.assertIn('Order Commands', content, "Order commands should be in help")
-                self.assertIn('place_order', content, "place_order command should be in help")
-                self.assertIn('my_orders', content, "my_orders command should be in help")
-                self.assertIn('order_status', content, "order_status command should be in help")
-                self.assertIn('Admin Commands', content, "Admin commands should be in help")
-                self.assertIn('confirm_payment', content, "confirm_payment command should be in help")
-                self.assertIn('update_order_status', content, "update_order_status command should be in help")
-        except Exception as e:
-            self.fail(f"Error testing discord_bot: {e}")
-
-    def test_bot_cogs_structure(self):
-        """Test the bot cogs structure"""
-        try:
-            # Check if the file exists
-            bot_cogs_file = self.backend_dir / 'bot_cogs.py'
-            self.assertTrue(bot_cogs_file.exists(), "bot_cogs.py should exist")
-            
-            # Check file content instead of importing
-            with open(bot_cogs_file, 'r') as f:
-                content = f.read()
-                
-                # Check for key class definitions
-                self.assertIn('class GeneralCog(commands.Cog):', content, "GeneralCog class should be defined")
-                self.assertIn('class NavigationCog(commands.Cog):', content, "NavigationCog class should be defined")
-                self.assertIn('class AdminCog(commands.Cog):', content, "AdminCog class should be defined")
-                
-                # Check for setup function
-                self.assertIn('async def setup_cogs(bot):', content, "setup_cogs function should be defined")
-                
-                # Check for key command definitions
-                self.assertIn('@app_commands.command(name="help"', content, "help command should be defined")
-                self.assertIn('@app_commands.command(name="ping"', content, "ping command should be defined")
-                self.assertIn('@app_commands.command(name="rules"', content, "rules command should be defined")
-                self.assertIn('@app_commands.command(name="join"', content, "join command should be defined")
-        except Exception as e:
-            self.fail(f"Error testing bot_cogs: {e}")
-
-    def test_order_cogs_structure(self):
-        """Test the order cogs structure"""
-        try:
-            # Check if the file exists
-            order_cogs_file = self.backend_dir / 'order_cogs.py'
-            self.assertTrue(order_cogs_file.exists(), "order_cogs.py should exist")
-            
-            # Check file content
-            with open(order_cogs_file, 'r') as f:
-                content = f.read()
-                
-                # Check for key class definitions
-                self.assertIn('class OrderCog(commands.Cog):', content, "OrderCog class should be defined")
-                self.assertIn('class AdminOrderCog(commands.Cog):', content, "AdminOrderCog class should be defined")
-                
-                # Check for setup function
-                self.assertIn('async def setup_order_cogs(bot):', content, "setup_order_cogs function should be defined")
-                
-                # Check for user commands
-                self.assertIn('@app_commands.command(name="place_order"', content, "place_order command should be defined")
-                self.assertIn('@app_commands.command(name="my_orders"', content, "my_orders command should be defined")
-                self.assertIn('@app_commands.command(name="order_status"', content, "order_status command should be defined")
-                
-                # Check for admin commands
-                self.assertIn('@app_commands.command(name="confirm_payment"', content, "confirm_payment command should be defined")
-                self.assertIn('@app_commands.command(name="update_order_status"', content, "update_order_status command should be defined")
-                self.assertIn('@app_commands.command(name="view_orders"', content, "view_orders command should be defined")
-                self.assertIn('@app_commands.command(name="search_orders"', content, "search_orders command should be defined")
-                self.assertIn('@app_commands.command(name="order_report"', content, "order_report command should be defined")
-                
-                # Check for admin permission checks
-                self.assertIn('def is_admin_or_mod', content, "is_admin_or_mod function should be defined")
-                self.assertIn('if not self.is_admin_or_mod', content, "Admin commands should check permissions")
-        except Exception as e:
-            self.fail(f"Error testing order_cogs: {e}")
+    def test_source_structure(self):
+        """Test the bot source files define the expected classes, handlers and commands"""
+        for name, needles in EXPECTED_SOURCE.items():
+            content = self._src[name]
+            # One combined pass per file; a needle sharing its start with a longer one is
+            # shadowed by it in the lookahead, so those fall back to a plain scan
+            pattern = re.compile('(?=(' + '|'.join(map(re.escape, sorted(needles, key=len, reverse=True))) + '))')
+            found = set(pattern.findall(content))
+            for needle, msg in needles.items():
+                with self.subTest(file=name, needle=needle):
+                    self.assertTrue(needle in found or needle in content, msg)
 
     def test_run_bot_script(self):
         """Test the bot launcher script"""
         try:
-            # Mock the main function to prevent actual bot startup
-            with patch('discord_bot.main'):
+            # Stub discord_bot so importing the launcher doesn't pull in discord.py and build the bot;
+            # patch.dict drops the stub and the freshly imported run_bot again afterwards
+            with patch.dict(sys.modules, {'discord_bot': MagicMock()}):
+                sys.modules.pop('run_bot', None)
                 # Mock sys.exit to prevent actual exit
                 with patch('sys.exit'):
                     # Import the run_bot module
-                    import run_bot
+                    importlib.import_module('run_bot')
                     
                     # The import should succeed without errors
                     self.assertTrue(True, "run_bot.py imported successfully")
@@ -220,94 +237,286 @@ class DiscordBotTests(unittest.TestCase):
         except Exception as e:
             self.fail(f"Error testing run_bot: {e}")
 
-    def test_bot_command_structure(self):
-        """Test the bot command structure"""
-        try:
-            # Check discord_bot.py for command definitions
-            discord_bot_file = self.backend_dir / 'discord_bot.py'
-            self.assertTrue(discord_bot_file.exists(), "discord_bot.py should exist")
+class BotConfigurationTests(unittest.IsolatedAsyncioTestCase):
+    """Test suite for batched configuration writes"""
+    
+    def setUp(self):
+        """Give each test its own config file, seeded with the defaults"""
+        from bot_config import BotConfiguration
+        self.BotConfiguration = BotConfiguration
+        
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.config_file = Path(temp_dir.name) / 'bot_config.json'
+        self.config_file.write_bytes(orjson.dumps(BotConfiguration(self.config_file).default_config()))
+        self.bot_config = BotConfiguration(self.config_file)
+    
+    async def test_mutation_flushed_once(self):
+        """Test a mutation marks the config dirty and flush() writes it once"""
+        self.assertFalse(self.bot_config._dirty, "A freshly loaded config has nothing to write")
+        
+        self.bot_config.update_keyword_response("order", "Orders are open!")
+        self.assertTrue(self.bot_config._dirty, "A mutation should mark the config dirty")
+        self.assertEqual(dict(self.bot_config.resolved.keyword_items)["order"], "Orders are open!")
+        
+        with patch.object(self.bot_config, 'save_config', wraps=self.bot_config.save_config) as save_config:
+            await self.bot_config.flush()
+            await self.bot_config.flush()
+        save_config.assert_awaited_once()
+        self.assertFalse(self.bot_config._dirty, "flush() should clear the dirty flag")
+        self.assertEqual(orjson.loads(self.config_file.read_bytes())["keywords_responses"]["order"], "Orders are open!")
+    
+    async def test_noop_mutations_stay_clean(self):
+        """Test mutations that change nothing don't mark the config dirty"""
+        keywords = self.bot_config.get_keywords_responses()
+        channels = self.bot_config.get_channels()
+        mutations = {
+            "update_keyword_response": lambda: self.bot_config.update_keyword_response("order", keywords["order"]),
+            "add_keyword_response": lambda: self.bot_config.add_keyword_response("help", keywords["help"]),
+            "update_channel": lambda: self.bot_config.update_channel("rules", channels["rules"]),
+            "remove_keyword_response": lambda: self.bot_config.remove_keyword_response("no-such-keyword"),
+        }
+        for name, mutate in mutations.items():
+            with self.subTest(mutator=name):
+                mutate()
+                self.assertFalse(self.bot_config._dirty)
+        
+        with patch.object(self.bot_config, 'save_config', new_callable=AsyncMock) as save_config:
+            await self.bot_config.flush()
+        save_config.assert_not_called()
+    
+    async def test_failed_flush_stays_dirty(self):
+        """Test a failed write leaves the change pending for the next flush"""
+        self.bot_config.remove_keyword_response("order")
+        with patch.object(self.bot_config, 'save_config', new_callable=AsyncMock, return_value=False):
+            await self.bot_config.flush()
+        self.assertTrue(self.bot_config._dirty, "A failed write should be retried")
+        
+        await self.bot_config.flush()
+        self.assertFalse(self.bot_config._dirty)
+        self.assertNotIn("order", orjson.loads(self.config_file.read_bytes())["keywords_responses"])
+    
+    async def test_missing_file_written_on_flush(self):
+        """Test a missing config file starts dirty and is created by the first flush"""
+        self.config_file.unlink()
+        bot_config = self.BotConfiguration(self.config_file)
+        self.assertTrue(bot_config._dirty, "The defaults should be pending a write")
+        
+        await bot_config.flush()
+        self.assertEqual(orjson.loads(self.config_file.read_bytes()), bot_config.default_config())
+
+class KeywordResponseTests(unittest.IsolatedAsyncioTestCase):
+    """Test suite for keyword matching and replies"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Import the bot module once; importing it builds the bot and its keyword matcher"""
+        import discord_bot
+        cls.discord_bot = discord_bot
+        cls.bot = discord_bot.bot
+        cls.KeywordMatcher = discord_bot.KeywordMatcher
+    
+    def setUp(self):
+        """Start every test with no keyword cooldowns"""
+        self.bot._keyword_cooldowns.clear()
+    
+    def _message(self, content, guild=True, can_send=True):
+        """Build a user message in a guild channel (or a DM) the bot may or may not post in"""
+        channel = MagicMock(id=42, send=AsyncMock())
+        channel.permissions_for.return_value = SimpleNamespace(send_messages=can_send)
+        return SimpleNamespace(
+            content=content,
+            author=SimpleNamespace(bot=False),
+            guild=SimpleNamespace(me=object()) if guild else None,
+            channel=channel,
+        )
+    
+    def test_longest_keyword_wins(self):
+        """Test nested and overlapping keywords resolve to the longest match, earliest on ties"""
+        keywords = {"ord": "short", "order": "long", "help": "help", "helpdesk": "desk", "desk": "desk only", "join": "join", "rule": "rule"}
+        cases = (
+            ("place an order", ("order", "long")),
+            ("ord please", ("ord", "short")),
+            ("the helpdesk is open", ("helpdesk", "desk")),
+            ("my desk", ("desk", "desk only")),
+            ("join and read the rules", ("join", "join")),
+            ("nothing to see", None),
+            ("", None),
+        )
+        # The result must not depend on the order the keywords were configured in
+        for matcher in (self.KeywordMatcher(keywords), self.KeywordMatcher(dict(reversed(keywords.items())))):
+            for text, expected in cases:
+                with self.subTest(text=text):
+                    self.assertEqual(matcher.find(text), expected)
+    
+    def test_matching_is_case_insensitive(self):
+        """Test messages are lowercased byte-wise, including around non-ASCII text"""
+        matcher = self.KeywordMatcher({"payment": "pay", "Order": "order"})
+        for text in ("PAYMENT", "PaYmEnT due", "café ORDER 🎉", "order", "ÖRDER payment"):
+            with self.subTest(text=text):
+                self.assertIsNotNone(matcher.find(text))
+        self.assertEqual(matcher.find("ÖRDER"), None, "Non-ASCII letters are not folded onto ASCII ones")
+        self.assertEqual(matcher.find("café ORDER 🎉"), ("Order", "order"), "The configured keyword is returned as-is")
+    
+    def test_prefilters(self):
+        """Test the matcher's prefilter attributes"""
+        matcher = self.KeywordMatcher({"order": "o", "help": "h"})
+        self.assertEqual(matcher.min_length, 4)
+        self.assertEqual(matcher.first_chars, frozenset("oOhH"))
+        
+        empty = self.KeywordMatcher({})
+        self.assertEqual((empty.min_length, empty.first_chars, empty.find("order")), (0, frozenset(), None))
+    
+    def test_non_ascii_keywords_rejected(self):
+        """Test keywords the byte-wise matcher can't fold are rejected when the matcher is built"""
+        with self.assertRaises(ValueError):
+            self.KeywordMatcher({"order": "o", "café": "c"})
+    
+    def test_keyword_cooldown(self):
+        """Test a keyword is suppressed per channel until its cooldown expires"""
+        cooldown = self.discord_bot.KEYWORD_COOLDOWN
+        with patch('discord_bot.time') as clock:
+            clock.monotonic.return_value = 1000.0
+            self.assertFalse(self.bot._keyword_on_cooldown(42, "order"), "The first reply starts the cooldown")
+            self.assertTrue(self.bot._keyword_on_cooldown(42, "order"), "A repeat straight away is suppressed")
             
-            with open(discord_bot_file, 'r') as f:
-                content = f.read()
-                self.assertIn('@bot.tree.command(name="help"', content, "help command should be defined")
-                self.assertIn('@bot.tree.command(name="ping"', content, "ping command should be defined")
-                
-            # Check order_cogs.py for order command definitions
-            order_cogs_file = self.backend_dir / 'order_cogs.py'
-            self.assertTrue(order_cogs_file.exists(), "order_cogs.py should exist")
+            # Other keywords and other channels have their own cooldowns
+            self.assertFalse(self.bot._keyword_on_cooldown(42, "help"))
+            self.assertFalse(self.bot._keyword_on_cooldown(7, "order"))
             
-            with open(order_cogs_file, 'r') as f:
-                content = f.read()
-                self.assertIn('@app_commands.command(name="place_order"', content, "place_order command should be defined")
-                self.assertIn('@app_commands.command(name="my_orders"', content, "my_orders command should be defined")
-                self.assertIn('@app_commands.command(name="order_status"', content, "order_status command should be defined")
-                self.assertIn('@app_commands.command(name="confirm_payment"', content, "confirm_payment command should be defined")
-                self.assertIn('@app_commands.command(name="update_order_status"', content, "update_order_status command should be defined")
-        except Exception as e:
-            self.fail(f"Error testing bot command structure: {e}")
+            clock.monotonic.return_value = 1000.0 + cooldown - 0.5
+            self.assertTrue(self.bot._keyword_on_cooldown(42, "order"), "Still suppressed just before expiry")
+            
+            # Once expired the keyword is answered again, which restarts its cooldown
+            clock.monotonic.return_value = 1000.0 + cooldown
+            self.assertFalse(self.bot._keyword_on_cooldown(42, "order"))
+            self.assertTrue(self.bot._keyword_on_cooldown(42, "order"))
+    
+    def test_keyword_cooldown_eviction(self):
+        """Test the cooldown table is capped, dropping the oldest entries and sweeping expired ones"""
+        cooldown = self.discord_bot.KEYWORD_COOLDOWN
+        with patch('discord_bot.time') as clock, patch('discord_bot.KEYWORD_COOLDOWN_MAX_ENTRIES', 3):
+            clock.monotonic.return_value = 0.0
+            for channel_id in (1, 2, 3):
+                self.bot._keyword_on_cooldown(channel_id, "order")
+            
+            # Past the cap, the oldest entry goes even though it hasn't expired
+            clock.monotonic.return_value = 1.0
+            self.bot._keyword_on_cooldown(4, "order")
+            self.assertEqual(list(self.bot._keyword_cooldowns), [(2, "order"), (3, "order"), (4, "order")])
+            
+            # An eviction also sweeps every expired entry behind the oldest
+            clock.monotonic.return_value = 1.0 + cooldown
+            self.bot._keyword_on_cooldown(5, "order")
+            self.assertEqual(self.bot._keyword_cooldowns, {(5, "order"): 1.0 + cooldown})
+            
+            # An evicted keyword is answered again
+            self.assertFalse(self.bot._keyword_on_cooldown(2, "order"))
+    
+    async def test_on_message_prefilters(self):
+        """Test which messages are scanned for keywords and answered"""
+        # (message, whether the matcher should run, whether a reply should be sent)
+        cases = (
+            (self._message("I want to ORDER something"), True, True),
+            (self._message("nothing to see here"), True, False),
+            (self._message("I want to order", guild=False), False, False),
+            (self._message("!order"), False, False),
+            (self._message("ord"), False, False),
+            (self._message("xyz 123"), False, False),
+            (self._message("I want to order", can_send=False), False, False),
+        )
+        matcher = self.discord_bot.config.keyword_matcher
+        for message, scanned, replied in cases:
+            with self.subTest(content=message.content, guild=message.guild is not None), \
+                    patch.object(matcher, 'find', wraps=matcher.find) as find, \
+                    patch.object(self.bot, 'process_commands', new_callable=AsyncMock) as process_commands:
+                await self.bot.on_message(message)
+                self.assertEqual(find.called, scanned)
+                if replied:
+                    message.channel.send.assert_awaited_once_with(self.discord_bot.config.keywords_responses["order"])
+                else:
+                    message.channel.send.assert_not_called()
+                # Commands are processed whether or not a keyword was answered
+                process_commands.assert_awaited_once_with(message)
+        
+        # Bot messages are ignored outright
+        message = self._message("order")
+        message.author.bot = True
+        with patch.object(self.bot, 'process_commands', new_callable=AsyncMock) as process_commands:
+            await self.bot.on_message(message)
+        message.channel.send.assert_not_called()
+        process_commands.assert_not_called()
 
-class OrderManagerTests(unittest.TestCase):
+class OrderManagerTests(unittest.IsolatedAsyncioTestCase):
     """Test suite for Order Management System"""
     
-    def setUp(self):
+    # 2023-01-01T12:00:00Z in milliseconds, the time every test's orders are stamped with
+    NOW_MS = 1672574400000
+    
+    async def asyncSetUp(self):
         """Set up test environment"""
-        self.backend_dir = Path(__file__).parent / 'backend'
-        os.chdir(self.backend_dir)
-        
-        # Create a temporary database file for testing
-        self.temp_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
-        self.temp_db.close()
-        
-        # Patch the OrderManager to use our temporary database
-        self.db_path_patcher = patch('order_manager.OrderManager.db_path', Path(self.temp_db.name))
-        self.db_path_patcher.start()
-        
-        # Import order manager after patching
         from order_manager import OrderManager, OrderStatus
-        import aiosqlite
         self.OrderManager = OrderManager
         self.OrderStatus = OrderStatus
-        self.aiosqlite = aiosqlite
         
-        # Create a test instance
-        self.order_manager = OrderManager()
+        # IsolatedAsyncioTestCase always runs its loop in debug mode; nothing here needs the instrumentation
+        asyncio.get_running_loop().set_debug(False)
+        
+        # Freeze the manager's clock; equal timestamps fall back to the id tie-breakers for ordering
+        self._clock_patcher = patch('order_manager._now_ms', return_value=self.NOW_MS)
+        self._clock_patcher.start()
+        
+        # Each test gets its own in-memory database, shared by the manager's
+        # connections and gone once the last of them closes
+        self.db_uri = f"file:orders_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.order_manager = OrderManager(self.db_uri)
+        await self.order_manager.initialize_db()
     
-    def tearDown(self):
+    async def asyncTearDown(self):
         """Clean up after tests"""
-        self.db_path_patcher.stop()
-        
-        # Remove temporary database
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
+        await self.order_manager.close()
+        self._clock_patcher.stop()
     
-    def run_async(self, coro):
-        """Helper to run async tests"""
-        return asyncio.get_event_loop().run_until_complete(coro)
+    async def _seed(self, *rows):
+        """Insert pending fixture orders, numbered ORD-001 onwards, with one multi-row INSERT"""
+        created_at = self.NOW_MS
+        params = []
+        for i, (user_id, username, product_name, quantity) in enumerate(rows, 1):
+            # Later rows are newer, as if placed one after another
+            params += (f"ORD-{i:03d}", user_id, username, product_name, quantity,
+                       self.OrderStatus.PENDING, created_at + i, created_at + i)
+        async with self.order_manager._write() as db:
+            await db.execute(
+                "INSERT INTO orders (order_number, user_id, username, product_name, quantity, status, created_at, updated_at) "
+                "VALUES " + ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?)"] * len(rows)),
+                params
+            )
     
-    def test_database_initialization(self):
+    async def test_database_initialization(self):
         """Test database initialization"""
-        # Initialize the database
-        self.run_async(self.order_manager.initialize_db())
-        
         # Check if the database was initialized
         self.assertTrue(self.order_manager.db_initialized, "Database should be initialized")
         
-        # Check if the database file exists
-        self.assertTrue(os.path.exists(self.temp_db.name), "Database file should exist")
-        
         # Check if tables were created by trying to insert and retrieve data
         async def check_tables():
-            async with self.aiosqlite.connect(self.temp_db.name) as db:
+            # Reuse the manager's persistent writer rather than opening another connection
+            async with self.order_manager._write() as db:
+                # Check the test database is attached (it lives in memory, so there is no file to look for)
+                cursor = await db.execute("PRAGMA database_list")
+                databases = {row[1] for row in await cursor.fetchall()}
+                self.assertIn("main", databases, "Database should be attached")
+                
                 # Check orders table
+                await db.execute("BEGIN")
                 await db.execute(
                     "INSERT INTO orders (order_number, user_id, username, product_name, quantity, status, created_at, updated_at) "
-                    "VALUES ('TEST-001', '123456789', 'TestUser', 'Test Product', 1, 'Pending', '2023-01-01', '2023-01-01')"
+                    "VALUES ('TEST-001', '123456789', 'TestUser', 'Test Product', 1, 0, 1672574400000, 1672574400000)"
                 )
                 
                 # Check order_history table
                 await db.execute(
                     "INSERT INTO order_history (order_number, status_from, status_to, changed_by, changed_at, notes) "
-                    "VALUES ('TEST-001', 'None', 'Pending', 'TestUser', '2023-01-01', 'Test note')"
+                    "VALUES ('TEST-001', 'None', 'Pending', 'TestUser', 1672574400000, 'Test note')"
                 )
                 
                 await db.commit()
@@ -321,237 +530,403 @@ class OrderManagerTests(unittest.TestCase):
                 count = (await cursor.fetchone())[0]
                 self.assertEqual(count, 1, "Should have 1 history entry in the database")
         
-        # Run the async test
-        self.run_async(check_tables())
+        await check_tables()
+    
+    async def test_legacy_schema_migration(self):
+        """Test initialize_db upgrades a database written before the schema was versioned"""
+        from order_manager import _SCHEMA_VERSION
+        legacy_uri = f"file:legacy_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        observer = sqlite3.connect(legacy_uri, uri=True)
+        self.addCleanup(observer.close)
+        
+        # The original schema: ISO-8601 text timestamps and status display names
+        observer.executescript("""
+            CREATE TABLE orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_number TEXT UNIQUE NOT NULL,
+                user_id TEXT NOT NULL,
+                username TEXT NOT NULL,
+                product_name TEXT NOT NULL,
+                quantity INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                payment_method TEXT DEFAULT 'PayPal',
+                created_at TIMESTAMP NOT NULL,
+                updated_at TIMESTAMP NOT NULL,
+                confirmed_by TEXT,
+                notes TEXT
+            );
+            CREATE TABLE order_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_number TEXT NOT NULL,
+                status_from TEXT NOT NULL,
+                status_to TEXT NOT NULL,
+                changed_by TEXT NOT NULL,
+                changed_at TIMESTAMP NOT NULL,
+                notes TEXT
+            );
+            INSERT INTO orders (order_number, user_id, username, product_name, quantity, status, created_at, updated_at, confirmed_by)
+            VALUES ('ORD-001', '123456789', 'TestUser', 'Gaming Mouse', 1, 'Pending', '2023-01-01T12:00:00', '2023-01-01T12:00:00', NULL),
+                   ('ORD-002', '123456789', 'TestUser', 'Keyboard', 2, 'Paid', '2023-01-01T12:00:00', '2023-01-01T12:00:00.250000', 'AdminUser');
+            INSERT INTO order_history (order_number, status_from, status_to, changed_by, changed_at)
+            VALUES ('ORD-002', 'Pending', 'Paid', 'AdminUser', '2023-01-01T12:00:00.250000');
+        """)
+        
+        legacy_manager = self.OrderManager(legacy_uri)
+        self.addAsyncCleanup(legacy_manager.close)
+        await legacy_manager.initialize_db()
+        
+        self.assertEqual(observer.execute("PRAGMA user_version").fetchone()[0], _SCHEMA_VERSION)
+        self.assertEqual(
+            observer.execute("SELECT order_number, status, created_at, updated_at FROM orders ORDER BY id").fetchall(),
+            [("ORD-001", self.OrderStatus.PENDING, self.NOW_MS, self.NOW_MS),
+             ("ORD-002", self.OrderStatus.PAID, self.NOW_MS, self.NOW_MS + 250)],
+            "Timestamps should be epoch milliseconds and statuses integer codes"
+        )
+        self.assertEqual(observer.execute("SELECT changed_at FROM order_history").fetchone()[0], self.NOW_MS + 250)
+        
+        # Migrated rows read back as before and are searchable
+        order = await legacy_manager.get_order("ORD-002")
+        self.assertEqual((order.status, order.confirmed_by), ("Paid", "AdminUser"))
+        self.assertEqual([o.order_number for o in await legacy_manager.search_orders("Gaming")], ["ORD-001"])
+        
+        # Numbering carries on from the legacy orders
+        self.assertEqual(await legacy_manager.generate_order_number(), "ORD-003")
+        order = await legacy_manager.create_order("123456789", "TestUser", "Headset", 1)
+        self.assertEqual(order.order_number, "ORD-003")
+        
+        # A second start finds the schema current and leaves the data alone
+        await legacy_manager.close()
+        restarted_manager = self.OrderManager(legacy_uri)
+        self.addAsyncCleanup(restarted_manager.close)
+        await restarted_manager.initialize_db()
+        self.assertEqual(observer.execute("SELECT COUNT(*) FROM orders").fetchone()[0], 3)
+        self.assertEqual(await restarted_manager.generate_order_number(), "ORD-004")
     
-    def test_order_number_generation(self):
+    async def test_order_number_generation(self):
         """Test order number generation"""
-        # Initialize the database
-        self.run_async(self.order_manager.initialize_db())
-        
         # Generate first order number
-        order_number = self.run_async(self.order_manager.generate_order_number())
+        order_number = await self.order_manager.generate_order_number()
         self.assertEqual(order_number, "ORD-001", "First order number should be ORD-001")
         
         # Create an order to increment the counter
-        self.run_async(self.order_manager.create_order("123", "TestUser", "Test Product", 1))
+        await self.order_manager.create_order("123", "TestUser", "Test Product", 1)
         
         # Generate second order number
-        order_number = self.run_async(self.order_manager.generate_order_number())
+        order_number = await self.order_manager.generate_order_number()
         self.assertEqual(order_number, "ORD-002", "Second order number should be ORD-002")
     
-    def test_create_order(self):
-        """Test order creation"""
-        # Initialize the database
-        self.run_async(self.order_manager.initialize_db())
+    async def test_concurrent_order_creation(self):
+        """Test order numbers stay unique and sequential under concurrent creation"""
+        orders = await asyncio.gather(*(
+            self.order_manager.create_order(str(i), f"User{i}", "Test Product", 1) for i in range(10)
+        ))
+        
+        # Orders come back in the order they were placed, numbered without gaps or duplicates
+        self.assertEqual(
+            [order.order_number for order in orders],
+            [f"ORD-{i:03d}" for i in range(1, 11)],
+            "Concurrent orders should be numbered ORD-001 to ORD-010"
+        )
+        
+        # The next number continues after the batch
+        order_number = await self.order_manager.generate_order_number()
+        self.assertEqual(order_number, "ORD-011", "Next order number should be ORD-011")
+    
+    def _open_observer(self):
+        """Open a plain connection to the test database, keeping it alive after the manager closes"""
+        observer = sqlite3.connect(self.db_uri, uri=True)
+        self.addCleanup(observer.close)
+        return observer
+    
+    async def test_close_waits_for_pending_orders(self):
+        """Test close() lets queued orders commit before closing the writer"""
+        from order_manager import ORDER_BATCH_WINDOW
+        observer = self._open_observer()
+        
+        # Hold the writer so the flush takes the batch and then has to wait for it
+        async with self.order_manager._write():
+            creations = [
+                asyncio.create_task(self.order_manager.create_order(str(i), f"User{i}", "Test Product", 1))
+                for i in range(3)
+            ]
+            await asyncio.sleep(ORDER_BATCH_WINDOW * 5)
+            self.assertFalse(self.order_manager._pending_orders, "The flush should have taken the batch")
+            
+            closing = asyncio.create_task(self.order_manager.close())
+            await asyncio.sleep(ORDER_BATCH_WINDOW)
+            self.assertFalse(closing.done(), "close() should wait for the in-flight flush")
         
+        await closing
+        orders = await asyncio.gather(*creations)
+        self.assertEqual([order.order_number for order in orders], ["ORD-001", "ORD-002", "ORD-003"])
+        
+        # Every order that was handed back is on disk, with its history entry
+        self.assertEqual(observer.execute("SELECT COUNT(*) FROM orders").fetchone()[0], 3)
+        self.assertEqual(observer.execute("SELECT COUNT(*) FROM order_history").fetchone()[0], 3)
+    
+    async def test_close_fails_pending_orders_loudly(self):
+        """Test queued orders whose write fails during shutdown raise to their callers"""
+        observer = self._open_observer()
+        
+        creations = [
+            asyncio.create_task(self.order_manager.create_order(str(i), f"User{i}", "Test Product", 1))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        failure = sqlite3.OperationalError("disk I/O error")
+        with patch.object(self.order_manager._writer, 'executemany', AsyncMock(side_effect=failure)):
+            await self.order_manager.close()
+        
+        # Nobody is told their order exists, and nothing half-written is left behind
+        results = await asyncio.gather(*creations, return_exceptions=True)
+        self.assertEqual(results, [failure] * 3, "Every pending creation should raise the write error")
+        self.assertEqual(observer.execute("SELECT COUNT(*) FROM orders").fetchone()[0], 0)
+    
+    async def test_create_order(self):
+        """Test order creation"""
         # Create an order
-        order = self.run_async(self.order_manager.create_order(
+        order = await self.order_manager.create_order(
             user_id="123456789",
             username="TestUser",
             product_name="Test Product",
             quantity=2
-        ))
+        )
         
         # Check order data
-        self.assertEqual(order["order_number"], "ORD-001", "Order number should be ORD-001")
-        self.assertEqual(order["user_id"], "123456789", "User ID should match")
-        self.assertEqual(order["username"], "TestUser", "Username should match")
-        self.assertEqual(order["product_name"], "Test Product", "Product name should match")
-        self.assertEqual(order["quantity"], 2, "Quantity should match")
-        self.assertEqual(order["status"], "Pending", "Status should be Pending")
-        self.assertEqual(order["payment_method"], "PayPal", "Payment method should be PayPal")
+        self.assertEqual(order.order_number, "ORD-001", "Order number should be ORD-001")
+        self.assertEqual(order.user_id, "123456789", "User ID should match")
+        self.assertEqual(order.username, "TestUser", "Username should match")
+        self.assertEqual(order.product_name, "Test Product", "Product name should match")
+        self.assertEqual(order.quantity, 2, "Quantity should match")
+        self.assertEqual(order.status, "Pending", "Status should be Pending")
+        self.assertEqual(order.payment_method, "PayPal", "Payment method should be PayPal")
         
         # Retrieve the order to verify it was saved
-        retrieved_order = self.run_async(self.order_manager.get_order("ORD-001"))
+        retrieved_order = await self.order_manager.get_order("ORD-001")
         self.assertIsNotNone(retrieved_order, "Order should be retrievable")
-        self.assertEqual(retrieved_order["order_number"], "ORD-001", "Retrieved order number should match")
-        self.assertEqual(retrieved_order["status"], "Pending", "Retrieved status should be Pending")
+        self.assertEqual(retrieved_order.order_number, "ORD-001", "Retrieved order number should match")
+        self.assertEqual(retrieved_order.status, "Pending", "Retrieved status should be Pending")
     
-    def test_update_order_status(self):
+    async def test_update_order_status(self):
         """Test order status updates"""
-        # Initialize the database
-        self.run_async(self.order_manager.initialize_db())
-        
         # Create an order
-        self.run_async(self.order_manager.create_order(
+        await self.order_manager.create_order(
             user_id="123456789",
             username="TestUser",
             product_name="Test Product",
             quantity=1
-        ))
+        )
         
         # Update status to Paid
-        success = self.run_async(self.order_manager.update_order_status(
+        success = await self.order_manager.update_order_status(
             order_number="ORD-001",
             new_status=self.OrderStatus.PAID,
             changed_by="AdminUser",
             notes="Payment received"
-        ))
+        )
         
         self.assertTrue(success, "Status update should succeed")
         
         # Verify status was updated
-        order = self.run_async(self.order_manager.get_order("ORD-001"))
-        self.assertEqual(order["status"], "Paid", "Status should be updated to Paid")
-        self.assertEqual(order["confirmed_by"], "AdminUser", "Confirmed by should be set")
-        self.assertEqual(order["notes"], "Payment received", "Notes should be set")
+        order = await self.order_manager.get_order("ORD-001")
+        self.assertEqual(order.status, "Paid", "Status should be updated to Paid")
+        self.assertEqual(order.confirmed_by, "AdminUser", "Confirmed by should be set")
+        self.assertEqual(order.notes, "Payment received", "Notes should be set")
         
         # Check order history
-        history = self.run_async(self.order_manager.get_order_history("ORD-001"))
+        history = await self.order_manager.get_order_history("ORD-001")
         self.assertEqual(len(history), 2, "Should have 2 history entries")
         self.assertEqual(history[0]["status_from"], "Pending", "First status change should be from Pending")
         self.assertEqual(history[0]["status_to"], "Paid", "First status change should be to Paid")
         
         # Update to next status
-        success = self.run_async(self.order_manager.update_order_status(
+        success = await self.order_manager.update_order_status(
             order_number="ORD-001",
             new_status=self.OrderStatus.PROCESSING,
             changed_by="AdminUser",
             notes="Order processing started"
-        ))
+        )
         
         self.assertTrue(success, "Second status update should succeed")
         
         # Verify status was updated again
-        order = self.run_async(self.order_manager.get_order("ORD-001"))
-        self.assertEqual(order["status"], "Processing", "Status should be updated to Processing")
+        order = await self.order_manager.get_order("ORD-001")
+        self.assertEqual(order.status, "Processing", "Status should be updated to Processing")
         
         # Check order history again
-        history = self.run_async(self.order_manager.get_order_history("ORD-001"))
+        history = await self.order_manager.get_order_history("ORD-001")
         self.assertEqual(len(history), 3, "Should have 3 history entries")
         self.assertEqual(history[0]["status_from"], "Paid", "Second status change should be from Paid")
         self.assertEqual(history[0]["status_to"], "Processing", "Second status change should be to Processing")
     
-    def test_get_user_orders(self):
+    async def test_get_order_cache_not_stale_after_concurrent_update(self):
+        """Test a row read before a concurrent status change is not left in the order cache"""
+        # Seeded rows bypass create_order, so the first lookup misses the cache
+        await self._seed(("123456789", "TestUser", "Test Product", 1))
+        
+        # Commit a status change after get_order's query has read the row but before it returns
+        connect = self.order_manager._connect
+        @asynccontextmanager
+        async def connect_then_update():
+            async with connect() as db:
+                async def execute_then_update(sql, params):
+                    row = await (await db.execute(sql, params)).fetchone()
+                    await self.order_manager.update_order_status("ORD-001", self.OrderStatus.PAID, "AdminUser")
+                    return SimpleNamespace(fetchone=AsyncMock(return_value=row))
+                yield SimpleNamespace(execute=execute_then_update)
+        
+        with patch.object(self.order_manager, '_connect', connect_then_update):
+            order = await self.order_manager.get_order("ORD-001")
+        self.assertEqual(order.status, "Pending", "The racing read should see the row as it was")
+        
+        # The next lookup must not be served the pre-update row
+        order = await self.order_manager.get_order("ORD-001")
+        self.assertEqual(order.status, "Paid", "Cached order should reflect the committed update")
+    
+    async def test_get_user_orders(self):
         """Test retrieving user orders"""
-        # Initialize the database
-        self.run_async(self.order_manager.initialize_db())
-        
-        # Create multiple orders for the same user
-        self.run_async(self.order_manager.create_order(
-            user_id="123456789",
-            username="TestUser",
-            product_name="Product A",
-            quantity=1
-        ))
-        
-        self.run_async(self.order_manager.create_order(
-            user_id="123456789",
-            username="TestUser",
-            product_name="Product B",
-            quantity=2
-        ))
-        
-        # Create an order for a different user
-        self.run_async(self.order_manager.create_order(
-            user_id="987654321",
-            username="OtherUser",
-            product_name="Product C",
-            quantity=3
-        ))
+        # Seed two orders for the same user and one for a different user
+        await self._seed(
+            ("123456789", "TestUser", "Product A", 1),
+            ("123456789", "TestUser", "Product B", 2),
+            ("987654321", "OtherUser", "Product C", 3),
+        )
         
         # Get orders for the first user
-        user_orders = self.run_async(self.order_manager.get_user_orders("123456789"))
+        user_orders = await self.order_manager.get_user_orders("123456789")
         
         # Check results
         self.assertEqual(len(user_orders), 2, "Should have 2 orders for the user")
-        self.assertEqual(user_orders[0]["product_name"], "Product B", "First order should be Product B (most recent)")
-        self.assertEqual(user_orders[1]["product_name"], "Product A", "Second order should be Product A")
+        self.assertEqual(user_orders[0].product_name, "Product B", "First order should be Product B (most recent)")
+        self.assertEqual(user_orders[1].product_name, "Product A", "Second order should be Product A")
         
         # Get orders for the second user
-        other_user_orders = self.run_async(self.order_manager.get_user_orders("987654321"))
+        other_user_orders = await self.order_manager.get_user_orders("987654321")
         
         # Check results
         self.assertEqual(len(other_user_orders), 1, "Should have 1 order for the other user")
-        self.assertEqual(other_user_orders[0]["product_name"], "Product C", "Order should be Product C")
+        self.assertEqual(other_user_orders[0].product_name, "Product C", "Order should be Product C")
     
-    def test_search_orders(self):
-        """Test searching orders"""
-        # Initialize the database
-        self.run_async(self.order_manager.initialize_db())
+    async def test_get_user_orders_page(self):
+        """Test paging through a user's orders with their total count"""
+        await self._seed(
+            *(("123456789", "TestUser", f"Product {i}", 1) for i in range(1, 8)),
+            ("987654321", "OtherUser", "Other Product", 1),
+        )
         
-        # Create test orders
-        self.run_async(self.order_manager.create_order(
-            user_id="123456789",
-            username="TestUser",
-            product_name="Gaming Mouse",
-            quantity=1
-        ))
+        # Newest first, limited to the page, with the total across every page
+        orders, total = await self.order_manager.get_user_orders_page("123456789", limit=5)
+        self.assertEqual(total, 7, "Total should count all of the user's orders")
+        self.assertEqual([order.order_number for order in orders], [f"ORD-{i:03d}" for i in range(7, 2, -1)])
+        self.assertEqual(orders[0].product_name, "Product 7")
         
-        self.run_async(self.order_manager.create_order(
-            user_id="987654321",
-            username="JohnDoe",
-            product_name="Gaming Keyboard",
-            quantity=1
-        ))
+        orders, total = await self.order_manager.get_user_orders_page("123456789", offset=5, limit=5)
+        self.assertEqual(total, 7)
+        self.assertEqual([order.order_number for order in orders], ["ORD-002", "ORD-001"])
         
-        self.run_async(self.order_manager.create_order(
-            user_id="555555555",
-            username="JaneSmith",
-            product_name="Gaming Headset",
-            quantity=1
-        ))
+        # The pages line up with the unpaged listing
+        all_orders = await self.order_manager.get_user_orders("123456789")
+        first_page, _ = await self.order_manager.get_user_orders_page("123456789", limit=3)
+        self.assertEqual(first_page, all_orders[:3])
+        
+        self.assertEqual(await self.order_manager.get_user_orders_page("000000000"), ([], 0))
+    
+    async def test_search_orders(self):
+        """Test searching orders"""
+        # Create test orders
+        await self._seed(
+            ("123456789", "TestUser", "Gaming Mouse", 1),
+            ("987654321", "JohnDoe", "Gaming Keyboard", 1),
+            ("555555555", "JaneSmith", "Gaming Headset", 1),
+        )
         
         # Update status of one order
-        self.run_async(self.order_manager.update_order_status(
+        await self.order_manager.update_order_status(
             order_number="ORD-002",
             new_status=self.OrderStatus.PAID,
             changed_by="AdminUser"
-        ))
+        )
         
         # Search by product name
-        results = self.run_async(self.order_manager.search_orders(query="Gaming"))
+        results = await self.order_manager.search_orders(query="Gaming")
         self.assertEqual(len(results), 3, "Should find all 3 gaming products")
         
         # Search by specific product
-        results = self.run_async(self.order_manager.search_orders(query="Mouse"))
+        results = await self.order_manager.search_orders(query="Mouse")
         self.assertEqual(len(results), 1, "Should find only the mouse product")
-        self.assertEqual(results[0]["product_name"], "Gaming Mouse", "Should find the mouse product")
+        self.assertEqual(results[0].product_name, "Gaming Mouse", "Should find the mouse product")
         
         # Search by username
-        results = self.run_async(self.order_manager.search_orders(query="John"))
+        results = await self.order_manager.search_orders(query="John")
         self.assertEqual(len(results), 1, "Should find only JohnDoe's order")
-        self.assertEqual(results[0]["username"], "JohnDoe", "Should find JohnDoe's order")
+        self.assertEqual(results[0].username, "JohnDoe", "Should find JohnDoe's order")
         
         # Search by status
-        results = self.run_async(self.order_manager.search_orders(status="Paid"))
+        results = await self.order_manager.search_orders(status="Paid")
         self.assertEqual(len(results), 1, "Should find only the paid order")
-        self.assertEqual(results[0]["order_number"], "ORD-002", "Should find order ORD-002")
+        self.assertEqual(results[0].order_number, "ORD-002", "Should find order ORD-002")
         
         # Search by status and query
-        results = self.run_async(self.order_manager.search_orders(query="Gaming", status="Pending"))
+        results = await self.order_manager.search_orders(query="Gaming", status="Pending")
         self.assertEqual(len(results), 2, "Should find 2 pending gaming products")
     
-    def test_get_order_stats(self):
-        """Test order statistics"""
-        # Initialize the database
-        self.run_async(self.order_manager.initialize_db())
+    async def test_search_orders_query_paths(self):
+        """Test full-text queries, short LIKE queries and queries containing quotes"""
+        await self._seed(
+            ("123456789", "TestUser", "Gaming Mouse", 1),
+            ("987654321", "JohnDoe", 'Gaming 27" Monitor', 1),
+            ("555555555", "JaneSmith", "Kid's Desk", 1),
+        )
         
+        # (query, order numbers found, newest first)
+        cases = (
+            # Three or more characters go through the trigram index, matching inside words and ignoring case
+            ("amin", ["ORD-002", "ORD-001"]),
+            ("gAmInG mOu", ["ORD-001"]),
+            ("ORD-003", ["ORD-003"]),
+            # Shorter queries fall back to LIKE over order number, username and product
+            ("HN", ["ORD-002"]),
+            ("01", ["ORD-001"]),
+            ("Q", []),
+            # Quotes are matched literally rather than parsed as query syntax
+            ('27"', ["ORD-002"]),
+            ('"', ["ORD-002"]),
+            ("'s", ["ORD-003"]),
+            ("Kid's", ["ORD-003"]),
+            ('" OR "', []),
+        )
+        for query, expected in cases:
+            with self.subTest(query=query):
+                results = await self.order_manager.search_orders(query=query)
+                self.assertEqual([order.order_number for order in results], expected)
+    
+    async def test_get_order_stats(self):
+        """Test order statistics"""
         # Create test orders
-        self.run_async(self.order_manager.create_order(
-            user_id="123456789",
-            username="TestUser",
-            product_name="Product A",
-            quantity=1
-        ))
-        
-        self.run_async(self.order_manager.create_order(
-            user_id="987654321",
-            username="OtherUser",
-            product_name="Product B",
-            quantity=2
-        ))
+        await asyncio.gather(
+            self.order_manager.create_order(
+                user_id="123456789",
+                username="TestUser",
+                product_name="Product A",
+                quantity=1
+            ),
+            self.order_manager.create_order(
+                user_id="987654321",
+                username="OtherUser",
+                product_name="Product B",
+                quantity=2
+            ),
+        )
         
         # Update status of one order
-        self.run_async(self.order_manager.update_order_status(
+        await self.order_manager.update_order_status(
             order_number="ORD-001",
             new_status=self.OrderStatus.PAID,
             changed_by="AdminUser"
-        ))
+        )
         
         # Get stats
-        stats = self.run_async(self.order_manager.get_order_stats())
+        stats = await self.order_manager.get_order_stats()
         
         # Check results
         self.assertEqual(stats["total_orders"], 2, "Should have 2 total orders")
@@ -559,38 +934,90 @@ class OrderManagerTests(unittest.TestCase):
         self.assertEqual(stats["status_counts"]["Paid"], 1, "Should have 1 paid order")
         self.assertEqual(stats["recent_orders"], 2, "Should have 2 recent orders")
 
-class OrderCogsTests(unittest.TestCase):
+class OrderCogsTests(unittest.IsolatedAsyncioTestCase):
     """Test suite for Order Cogs"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.backend_dir = Path(__file__).parent / 'backend'
-        os.chdir(self.backend_dir)
-        
-        # Import necessary modules
+    @classmethod
+    def setUpClass(cls):
+        """Build the cogs and the mocks and fixtures they run against once for the whole class"""
         from order_cogs import OrderCog, AdminOrderCog
-        from order_manager import OrderManager, OrderStatus
+        from order_manager import OrderManager, OrderRow, OrderStatus
+        cls.OrderStatus = OrderStatus
         
         # Mock the bot
-        self.bot = MagicMock()
-        
-        # Mock the order manager
-        self.order_manager = MagicMock(spec=OrderManager)
-        
-        # Create a patch for the global order_manager in order_cogs
-        self.order_manager_patcher = patch('order_cogs.order_manager', self.order_manager)
-        self.order_manager_patcher.start()
+        cls.bot = MagicMock()
+        
+        # Speccing introspects the whole OrderManager surface, so do it once and reset per test
+        cls.order_manager = MagicMock(spec=OrderManager)
+        
+        # Patch the global order_manager in order_cogs while the cogs pick it up
+        with patch('order_cogs.order_manager', cls.order_manager):
+            # Create cog instances; they keep no per-test state, so every test can share them
+            cls.order_cog = OrderCog(cls.bot)
+            cls.admin_order_cog = AdminOrderCog(cls.bot)
+        
+        # Users with different roles; the permission check only reads role ids and names
+        roles = {name: SimpleNamespace(id=role_id, name=name) for role_id, name in enumerate(("admin", "moderator", "member"), 1)}
+        guild = SimpleNamespace(id=1, roles=list(roles.values()))
+        cls.admin_user = SimpleNamespace(guild=guild, roles=[roles["admin"]])
+        cls.mod_user = SimpleNamespace(guild=guild, roles=[roles["moderator"]])
+        cls.regular_user = SimpleNamespace(guild=guild, roles=[roles["member"]])
+        
+        # Sample orders returned by the mocked manager; OrderRow is frozen, so tests can share them
+        cls.placed_order = OrderRow(
+            order_number="ORD-001",
+            user_id="123456789",
+            username="TestUser",
+            product_name="Test Product",
+            quantity=1,
+            status="Pending",
+            payment_method="PayPal",
+            created_at=1672574400000,
+            updated_at=1672574400000,
+            confirmed_by=None,
+            notes=None
+        )
+        cls.customer_order = replace(cls.placed_order, user_id="987654321", username="CustomerUser")
+        cls.paid_customer_order = replace(cls.customer_order, status="Paid")
         
-        # Create cog instances
-        self.order_cog = OrderCog(self.bot)
-        self.admin_order_cog = AdminOrderCog(self.bot)
+        # Prototype interaction shared by the command tests and reset before each one
+        cls._interaction = AsyncMock()
+        cls._interaction.user.id = 123456789
         
-        # Store OrderStatus for testing
-        self.OrderStatus = OrderStatus
+        # The tests only check that an embed is sent, so skip building real ones
+        cls._embed_patcher = patch('discord.Embed')
+        cls._embed_patcher.start()
     
-    def tearDown(self):
-        """Clean up after tests"""
-        self.order_manager_patcher.stop()
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after the class"""
+        cls._embed_patcher.stop()
+    
+    def setUp(self):
+        """Set up test environment"""
+        # Clear whatever the previous test configured on the class-wide mocks
+        self.bot.reset_mock(return_value=True, side_effect=True)
+        self.order_manager.reset_mock(return_value=True, side_effect=True)
+        
+        # Same for the interaction; reset_mock keeps configured attributes, so restore the ones tests change
+        self.interaction = self._interaction
+        self.interaction.reset_mock()
+        self.interaction.user.display_name = "TestUser"
+        self.interaction.user.roles = []
+        
+        # The customer the admin commands DM, found in the bot's user cache
+        self.customer = SimpleNamespace(send=AsyncMock())
+        self.bot.get_user.return_value = self.customer
+    
+    async def asyncSetUp(self):
+        """Turn off the debug mode IsolatedAsyncioTestCase enables on its loop"""
+        asyncio.get_running_loop().set_debug(False)
+    
+    async def assertCustomerNotified(self, times=1):
+        """Wait for the admin cog's background DMs and check the customer got an embed each time"""
+        await asyncio.gather(*self.admin_order_cog._bg_tasks)
+        self.bot.get_user.assert_called_with(987654321)
+        self.assertEqual([set(c.kwargs) for c in self.customer.send.await_args_list], [{"embed"}] * times)
     
     def test_order_cog_initialization(self):
         """Test OrderCog initialization"""
@@ -604,113 +1031,59 @@ class OrderCogsTests(unittest.TestCase):
     
     def test_admin_permission_check(self):
         """Test admin permission check"""
-        # Create mock users with different roles
-        admin_user = MagicMock()
-        admin_user.roles = [MagicMock(name="admin")]
-        
-        mod_user = MagicMock()
-        mod_user.roles = [MagicMock(name="moderator")]
-        
-        regular_user = MagicMock()
-        regular_user.roles = [MagicMock(name="member")]
-        
-        # Test permission checks
-        self.assertTrue(self.admin_order_cog.is_admin_or_mod(admin_user), "Admin user should have permission")
-        self.assertTrue(self.admin_order_cog.is_admin_or_mod(mod_user), "Moderator user should have permission")
-        self.assertFalse(self.admin_order_cog.is_admin_or_mod(regular_user), "Regular user should not have permission")
+        self.assertTrue(self.admin_order_cog.is_admin_or_mod(self.admin_user), "Admin user should have permission")
+        self.assertTrue(self.admin_order_cog.is_admin_or_mod(self.mod_user), "Moderator user should have permission")
+        self.assertFalse(self.admin_order_cog.is_admin_or_mod(self.regular_user), "Regular user should not have permission")
     
-    def test_place_order_command_validation(self):
+    async def test_place_order_command_validation(self):
         """Test place_order command validation"""
-        # Create mock interaction
-        interaction = AsyncMock()
-        interaction.user.id = 123456789
-        interaction.user.display_name = "TestUser"
-        
-        # Test with invalid quantity
-        asyncio.run(self.order_cog.place_order(interaction, "Test Product", 0))
-        interaction.response.send_message.assert_called_with("❌ Quantity must be a positive number!", ephemeral=True)
-        
-        # Reset mock
-        interaction.response.send_message.reset_mock()
-        
-        # Test with too large quantity
-        asyncio.run(self.order_cog.place_order(interaction, "Test Product", 101))
-        interaction.response.send_message.assert_called_with("❌ Quantity cannot exceed 100 items per order!", ephemeral=True)
+        interaction = self.interaction
         
-        # Reset mock
-        interaction.response.send_message.reset_mock()
-        
-        # Test with invalid product name
-        asyncio.run(self.order_cog.place_order(interaction, " ", 1))
-        interaction.response.send_message.assert_called_with("❌ Product name must be at least 2 characters!", ephemeral=True)
+        for product_name, quantity, expected in PLACE_ORDER_VALIDATION_CASES:
+            with self.subTest(product_name=product_name, quantity=quantity):
+                interaction.response.send_message.reset_mock()
+                await self.order_cog.place_order.callback(self.order_cog, interaction, product_name, quantity)
+                self.assertEqual(interaction.response.send_message.call_args, expected)
     
-    def test_place_order_command_success(self):
+    async def test_place_order_command_success(self):
         """Test successful place_order command"""
-        # Create mock interaction
-        interaction = AsyncMock()
-        interaction.user.id = 123456789
-        interaction.user.display_name = "TestUser"
+        interaction = self.interaction
         
         # Mock order_manager.create_order to return a sample order
-        sample_order = {
-            "order_number": "ORD-001",
-            "user_id": "123456789",
-            "username": "TestUser",
-            "product_name": "Test Product",
-            "quantity": 1,
-            "status": "Pending",
-            "created_at": "2023-01-01T12:00:00",
-            "payment_method": "PayPal"
-        }
-        self.order_manager.create_order = AsyncMock(return_value=sample_order)
+        self.order_manager.create_order = _async_return(self.placed_order)
         
         # Call the command
-        asyncio.run(self.order_cog.place_order(interaction, "Test Product", 1))
+        await self.order_cog.place_order.callback(self.order_cog, interaction, "Test Product", 1)
         
-        # Verify order_manager.create_order was called with correct parameters
-        self.order_manager.create_order.assert_called_with(
+        # Verify order_manager.create_order was called once with correct parameters
+        self.assertEqual(self.order_manager.create_order.mock_calls, [call(
             user_id="123456789",
             username="TestUser",
             product_name="Test Product",
             quantity=1
-        )
-        
-        # Verify response was sent
-        interaction.response.send_message.assert_called_once()
+        )])
         
-        # Check that the embed was created (we can't easily check the content)
-        args, kwargs = interaction.response.send_message.call_args
-        self.assertIn("embed", kwargs)
+        # Verify exactly one response was sent, carrying an embed (we can't easily check the content)
+        self.assertEqual([set(c.kwargs) for c in interaction.response.send_message.mock_calls], [{"embed"}])
     
-    def test_confirm_payment_command(self):
+    async def test_confirm_payment_command(self):
         """Test confirm_payment command"""
-        # Create mock interaction with admin user
-        interaction = AsyncMock()
-        interaction.user.id = 123456789
+        # Act as an admin user
+        interaction = self.interaction
         interaction.user.display_name = "AdminUser"
-        interaction.user.roles = [MagicMock(name="admin")]
         
         # Mock order_manager.get_order to return a sample order
-        sample_order = {
-            "order_number": "ORD-001",
-            "user_id": "987654321",
-            "username": "CustomerUser",
-            "product_name": "Test Product",
-            "quantity": 1,
-            "status": "Pending",
-            "created_at": "2023-01-01T12:00:00",
-            "payment_method": "PayPal"
-        }
-        self.order_manager.get_order = AsyncMock(return_value=sample_order)
+        self.order_manager.get_order = _async_return(self.customer_order)
         
         # Mock order_manager.update_order_status to return success
-        self.order_manager.update_order_status = AsyncMock(return_value=True)
+        self.order_manager.update_order_status = _async_return(True)
         
-        # Mock bot.fetch_user to return a user
-        self.bot.fetch_user = AsyncMock(return_value=MagicMock())
+        # Call the command; permissions are covered by test_admin_permission_check
+        with patch.object(self.admin_order_cog, 'is_admin_or_mod', return_value=True) as is_admin_or_mod:
+            await self.admin_order_cog.confirm_payment.callback(self.admin_order_cog, interaction, "ORD-001", "Payment received via PayPal")
         
-        # Call the command
-        asyncio.run(self.admin_order_cog.confirm_payment(interaction, "ORD-001", "Payment received via PayPal"))
+        # Verify the permission check was consulted for the invoking user
+        is_admin_or_mod.assert_called_once_with(interaction.user)
         
         # Verify order_manager.get_order was called with correct parameters
         self.order_manager.get_order.assert_called_with("ORD-001")
@@ -723,42 +1096,34 @@ class OrderCogsTests(unittest.TestCase):
             "Payment received via PayPal"
         )
         
-        # Verify response was sent
-        interaction.response.send_message.assert_called_once()
+        # Verify the interaction was deferred and the result sent as a followup
+        interaction.response.defer.assert_called_once_with(ephemeral=True)
+        interaction.followup.send.assert_called_once()
         
         # Check that the confirmation message was sent
-        args, kwargs = interaction.response.send_message.call_args
-        self.assertIn("✅ Payment confirmed for order ORD-001", args[0])
+        self.assertIn("✅ Payment confirmed for order ORD-001", interaction.followup.send.call_args.args[0])
+        
+        # Verify the customer was sent a DM with the update
+        await self.assertCustomerNotified()
     
-    def test_update_order_status_command(self):
+    async def test_update_order_status_command(self):
         """Test update_order_status command"""
-        # Create mock interaction with admin user
-        interaction = AsyncMock()
-        interaction.user.id = 123456789
+        # Act as an admin user
+        interaction = self.interaction
         interaction.user.display_name = "AdminUser"
-        interaction.user.roles = [MagicMock(name="admin")]
         
         # Mock order_manager.get_order to return a sample order
-        sample_order = {
-            "order_number": "ORD-001",
-            "user_id": "987654321",
-            "username": "CustomerUser",
-            "product_name": "Test Product",
-            "quantity": 1,
-            "status": "Paid",
-            "created_at": "2023-01-01T12:00:00",
-            "payment_method": "PayPal"
-        }
-        self.order_manager.get_order = AsyncMock(return_value=sample_order)
+        self.order_manager.get_order = _async_return(self.paid_customer_order)
         
         # Mock order_manager.update_order_status to return success
-        self.order_manager.update_order_status = AsyncMock(return_value=True)
+        self.order_manager.update_order_status = _async_return(True)
         
-        # Mock bot.fetch_user to return a user
-        self.bot.fetch_user = AsyncMock(return_value=MagicMock())
+        # Call the command; permissions are covered by test_admin_permission_check
+        with patch.object(self.admin_order_cog, 'is_admin_or_mod', return_value=True) as is_admin_or_mod:
+            await self.admin_order_cog.update_order_status.callback(self.admin_order_cog, interaction, "ORD-001", "Processing", "Order processing started")
         
-        # Call the command
-        asyncio.run(self.admin_order_cog.update_order_status(interaction, "ORD-001", "Processing", "Order processing started"))
+        # Verify the permission check was consulted for the invoking user
+        is_admin_or_mod.assert_called_once_with(interaction.user)
         
         # Verify order_manager.get_order was called with correct parameters
         self.order_manager.get_order.assert_called_with("ORD-001")
@@ -771,12 +1136,72 @@ class OrderCogsTests(unittest.TestCase):
             "Order processing started"
         )
         
-        # Verify response was sent
-        interaction.response.send_message.assert_called_once()
+        # Verify the interaction was deferred and the result sent as a followup
+        interaction.response.defer.assert_called_once_with(ephemeral=True)
+        interaction.followup.send.assert_called_once()
         
         # Check that the confirmation message was sent
-        args, kwargs = interaction.response.send_message.call_args
-        self.assertIn("✅ Order ORD-001 status updated to Processing", args[0])
+        self.assertIn("✅ Order ORD-001 status updated to Processing", interaction.followup.send.call_args.args[0])
+        
+        # Verify the customer was sent a DM with the update
+        await self.assertCustomerNotified()
+    
+    async def test_orders_paginator_owner_and_timeout(self):
+        """Test the order pager only pages for its invoker and disables itself on timeout"""
+        from order_cogs import OrdersPaginator, ORDERS_PER_PAGE
+        
+        paginator = OrdersPaginator([self.placed_order] * (ORDERS_PER_PAGE + 1), "Orders", "All orders")
+        await paginator.send(self.interaction)
+        
+        # Another user's click is refused; the invoker's goes through
+        stranger = AsyncMock()
+        stranger.user.id = 987654321
+        self.assertFalse(await paginator.interaction_check(stranger), "Other users should not page")
+        stranger.response.send_message.assert_called_once()
+        self.assertTrue(await paginator.interaction_check(self.interaction), "The invoking user should page")
+        
+        # Once the view times out, every button is disabled on the original message
+        await paginator.on_timeout()
+        self.assertTrue(all(child.disabled for child in paginator.children), "Buttons should be disabled")
+        self.interaction.edit_original_response.assert_called_with(view=paginator)
+    
+    async def test_admin_commands_batch(self):
+        """Test confirm_payment and update_order_status running concurrently on separate interactions"""
+        # Independent interactions for two admins acting at the same time
+        confirm_interaction, update_interaction = AsyncMock(), AsyncMock()
+        confirm_interaction.user.display_name = update_interaction.user.display_name = "AdminUser"
+        
+        # One pending and one paid order, looked up by number
+        lookups = {
+            "ORD-001": _async_return(self.customer_order),
+            "ORD-002": _async_return(replace(self.paid_customer_order, order_number="ORD-002")),
+        }
+        self.order_manager.get_order = MagicMock(side_effect=lambda order_number: lookups[order_number]())
+        self.order_manager.update_order_status = _async_return(True)
+        
+        # Permissions are covered by test_admin_permission_check
+        with patch.object(self.admin_order_cog, 'is_admin_or_mod', return_value=True):
+            await asyncio.gather(
+                self.admin_order_cog.confirm_payment.callback(
+                    self.admin_order_cog, confirm_interaction, "ORD-001", "Payment received via PayPal"
+                ),
+                self.admin_order_cog.update_order_status.callback(
+                    self.admin_order_cog, update_interaction, "ORD-002", "Processing", "Order processing started"
+                ),
+            )
+        
+        # Both status changes reached the manager
+        self.assertCountEqual(self.order_manager.update_order_status.mock_calls, [
+            call("ORD-001", self.OrderStatus.PAID, "AdminUser", "Payment received via PayPal"),
+            call("ORD-002", self.OrderStatus.PROCESSING, "AdminUser", "Order processing started"),
+        ])
+        
+        # Each admin got their own confirmation
+        self.assertIn("✅ Payment confirmed for order ORD-001", confirm_interaction.followup.send.call_args.args[0])
+        self.assertIn("✅ Order ORD-002 status updated to Processing", update_interaction.followup.send.call_args.args[0])
+        
+        # The customer owns both orders, so gets one DM per change
+        await self.assertCustomerNotified(times=2)
 
 if __name__ == '__main__':
     unittest.main()